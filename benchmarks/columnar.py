@@ -0,0 +1,60 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Extracts the scalar columns of a batch of updates by decoding Update objects and with decode_columns,
+then counts messages per chat from the result.
+
+Usage: python benchmarks/columnar.py [updates]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.columnar import CHAT_TYPES, decode_columns
+from bf_telegram.api.decoder import decode_updates
+from decode import sample
+
+def objects(batch):
+    rows = []
+    for update in decode_updates(batch):
+        message = update.message
+        rows.append((update.update_id, 0, message.message_id, message.date, message.chat.id,
+                     CHAT_TYPES.index(message.chat.type), message.from_.id_ if message.from_ else 0,
+                     len(message.text or message.caption or "")))
+    return rows
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch = [sample(i) for i in range(1, count + 1)]
+    for update in batch:
+        update["message"]["chat"] = dict(update["message"]["chat"], id=-1000000000000 - update["update_id"] % 100)
+    rows = objects(batch)
+    columns = decode_columns(batch)
+    assert [list(row) for row in zip(*rows)] == [values.tolist() for values in columns.arrays.values()]
+    assert Counter(row[4] for row in rows) == Counter(columns.chat_id)
+    for name, function in (("objects", lambda: Counter(row[4] for row in objects(batch))),
+                           ("columns", lambda: Counter(decode_columns(batch).chat_id))):
+        seconds = min(timeit.repeat(function, number=1, repeat=5))
+        tracemalloc.start()
+        result = function()
+        size = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del result
+        print(f"{name:>8}: {seconds / count * 1e6:6.2f} us/update, peak {size / count:7.0f} bytes/update")
+    try:
+        import numpy
+    except ImportError:
+        return
+    arrays = decode_columns(batch).to_numpy()
+    chats, counts = numpy.unique(arrays["chat_id"], return_counts=True)
+    assert dict(zip(chats.tolist(), counts.tolist())) == Counter(row[4] for row in rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Compares the compiled decoder with a naive recursive ``cls(**kwargs)`` decoder.
+
+Usage: python benchmarks/decode.py [updates]
+"""
+
+import os
+import sys
+import timeit
+from typing import get_args, get_origin
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import NESTED, decode_updates, parameters, wire_name
+from bf_telegram.api.update import Update
+
+NAMES = {cls: {wire_name(parameter.name): parameter.name for parameter in parameters(cls)} for cls in NESTED}
+
+def naive(cls, data):
+    nested = NESTED.get(cls, {})
+    names = NAMES[cls]
+    kwargs = {}
+    for key, value in data.items():
+        type_ = nested.get(key)
+        if type_ is not None and value is not None:
+            if get_origin(type_) is list:
+                value = [naive(get_args(type_)[0], item) for item in value]
+            else:
+                value = naive(type_, value)
+        kwargs[names[key]] = value
+    return cls(**kwargs)
+
+def sample(update_id):
+    user = {"id": 10000 + update_id % 50, "is_bot": False, "first_name": "Ivan", "username": "ivan", "language_code": "ru"}
+    chat = {"id": -1001234567890, "type": "supergroup", "title": "Chat"}
+    message = {"message_id": update_id, "from": user, "chat": chat, "date": 1680000000 + update_id,
+               "text": "/start@bot hello https://example.com",
+               "entities": [{"type": "bot_command", "offset": 0, "length": 10},
+                            {"type": "url", "offset": 17, "length": 19}]}
+    if update_id % 4 == 0:
+        message["reply_to_message"] = dict(message, message_id=update_id - 1, text="previous")
+    if update_id % 5 == 0:
+        message["photo"] = [{"file_id": f"AgAC{update_id}{size}", "file_unique_id": f"AQAD{update_id}{size}",
+                             "width": size, "height": size, "file_size": size * 100} for size in (90, 320, 800, 1280)]
+        message["caption"] = message.pop("text")
+        message["caption_entities"] = message.pop("entities")
+    return {"update_id": update_id, "message": message}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    batch = [sample(i) for i in range(1, count + 1)]
+    naive_batch = lambda: [naive(Update, update) for update in batch]
+    compiled_batch = lambda: decode_updates(batch)
+    compiled_batch()
+    for name, function in (("naive **kwargs", naive_batch), ("compiled", compiled_batch)):
+        seconds = min(timeit.repeat(function, number=1, repeat=5))
+        print(f"{name:>16}: {seconds / count * 1e6:8.2f} us/update")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Measures encoding throughput of decoded updates, checking first that every update encodes back to the JSON it was
+decoded from and that edge cases of plain values are encoded like json.dumps does; the exit status is 1 if not.
+The checked updates are the benchmarked ones and the synthetic traffic of payloads.py, which has entities, captions,
+nested replies, raw dict fields (reply markup) and non-ASCII text. json.dumps of the original dicts is given
+for reference.
+
+Usage: python benchmarks/encode.py [corpus.jsonl]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import decode_updates
+from bf_telegram.api.encoder import encode
+from bf_telegram.api.message_entity import MessageEntity
+from decode import sample
+from lazy import load
+from payloads import generate
+
+VALUES = [
+    # Value, the JSON it encodes to
+    (None, None),
+    ({"text": "привет \U0001F600 \"quoted\"\n", "skipped": None, "list": [1, None, 2.5, True, False, "é"]},
+     {"text": "привет \U0001F600 \"quoted\"\n", "list": [1, None, 2.5, True, False, "é"]}),
+    ({1: "int", 2.5: "float", False: "bool", None: "none"},
+     {"1": "int", "2.5": "float", "false": "bool", "null": "none"}),
+    ((1, (2, 3)), [1, [2, 3]]),
+    ({}, {}),
+    ([], []),
+    ({"entities": [MessageEntity("text_link", 0, 4, url="https://example.com/ü")]},
+     {"entities": [{"type": "text_link", "offset": 0, "length": 4, "url": "https://example.com/ü"}]}),
+]
+
+INVALID = [
+    # Value, the error it raises
+    (float("nan"), ValueError),
+    ([float("inf")], ValueError),
+    ({"value": -float("inf")}, ValueError),
+    ({float("nan"): 1}, ValueError),
+    ({(1, 2): 1}, TypeError),
+    (object(), TypeError),
+]
+
+def check(corpus):
+    """
+    :return: Descriptions of the values not encoded as expected
+    """
+    failures = [f"{data} encoded as {encode(update)!r}" for update, data in zip(decode_updates(corpus), corpus)
+                if json.loads(encode(update)) != data]
+    failures += [f"{value!r} encoded as {encode(value)!r}" for value, expected in VALUES
+                 if json.loads(encode(value)) != expected]
+    for value, error in INVALID:
+        try:
+            failures.append(f"{value!r} encoded as {encode(value)!r}")
+        except error:
+            pass
+    return failures
+
+def main():
+    corpus = load(sys.argv[1]) if len(sys.argv) > 1 else [sample(i) for i in range(1, 10001)]
+    failures = check(corpus + generate(10000))
+    if failures:
+        print("\n".join(failures[:10]))
+        print(f"{len(failures)} values not encoded as expected")
+        sys.exit(1)
+    updates = decode_updates(corpus)
+    size = sum(len(encode(update)) for update in updates)
+    for name, function in (("encode", lambda: [encode(update) for update in updates]),
+                           ("json.dumps dicts", lambda: [json.dumps(data).encode() for data in corpus])):
+        seconds = min(timeit.repeat(function, number=1, repeat=5))
+        print(f"{name:>16}: {seconds / len(updates) * 1e6:8.2f} us/update {size / seconds / 1e6:8.1f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Extracts all entities of 4096-character messages with EntityText and by re-encoding the text to UTF-16 per entity.
+
+Usage: python benchmarks/entity_text.py [entities per message]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.message import Message
+from bf_telegram.api.message_entity import MessageEntity
+from bf_telegram.api.entity_text import entities
+
+def message(alphabet, count):
+    random.seed(1)
+    words = ["".join(random.choice(alphabet) for _ in range(random.randint(2, 9))) for _ in range(2000)]
+    text = ""
+    while len(text) < 4096:
+        text += random.choice(words) + " "
+    text = text[:4096]
+    units = [0]
+    for character in text:
+        units.append(units[-1] + (2 if character > "￿" else 1))
+    starts = sorted(random.sample(range(4000), count))
+    message_entities = [MessageEntity("mention", units[start], units[start + random.randint(1, 90)] - units[start])
+                        for start in starts]
+    return Message(1, text=text, entities=message_entities)
+
+def naive(message):
+    return [(entity, message.text.encode("utf-16-le")[entity.offset * 2:(entity.offset + entity.length) * 2]
+             .decode("utf-16-le")) for entity in message.entities]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    for name, alphabet in (("ASCII", "abcdefghijklmnopqrstuvwxyz"),
+                           ("Cyrillic", "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"),
+                           ("emoji", "abcdefgh\U0001F600\U0001F602\U0001F44D\U0001F525абвг")):
+        sample = message(alphabet, count)
+        assert [text for _, text in entities(sample)] == [text for _, text in naive(sample)]
+        for method, function in (("re-encode", lambda: naive(sample)), ("EntityText", lambda: list(entities(sample)))):
+            seconds = min(timeit.repeat(function, number=20, repeat=5)) / 20
+            print(f"{name:>8} {method:>10}: {seconds * 1e6:9.1f} us/message, {seconds / count * 1e9:7.0f} ns/entity")
+
+if __name__ == "__main__":
+    main()
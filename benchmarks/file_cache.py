@@ -0,0 +1,68 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Fetches files referenced by a stream of messages from a local stub Bot API server, where most messages refer to a few
+popular files, downloading every reference into memory and through FileCache.
+
+Usage: python benchmarks/file_cache.py [references] [distinct files] [file size in KiB]
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.bot_api import BotApi
+from bf_telegram.api.document import Document
+from bf_telegram.api.file import File
+from bf_telegram.api.file_cache import FileCache
+from stub_bot_api import StubBotApi
+
+async def run(name, fetch, references, stub):
+    downloads = stub.downloads
+    started = time.perf_counter()
+    await asyncio.gather(*map(fetch, references))
+    seconds = time.perf_counter() - started
+    print(f"{name:>10}: {len(references) / seconds:8.0f} references/s, {stub.downloads - downloads} downloads")
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    size = (int(sys.argv[3]) if len(sys.argv) > 3 else 256) * 1024
+    stub = StubBotApi()
+    documents = []
+    for number in range(distinct):
+        stub.add_file(f"file{number}", f"unique{number}", os.urandom(size))
+        documents.append(Document(f"file{number}", f"unique{number}", file_size=size))
+    random.seed(1)
+    references = random.choices(documents, weights=[1 / (rank + 1) for rank in range(distinct)], k=count)
+    api = BotApi("123:token", await stub.start())
+    directory = tempfile.mkdtemp()
+    try:
+        async def download(document):
+            chunks = []
+            await api.download((await File.get_file(api, document.file_id)).file_path, chunks.append)
+            return b"".join(chunks)
+
+        cache = FileCache(api, directory, max_size=distinct * size // 2)
+        await run("download", download, references, stub)
+        await run("FileCache", cache.get, references, stub)
+        print(f"hits {cache.hits}, coalesced {cache.coalesced}, misses {cache.misses}, cached {cache.size} bytes")
+        for document in documents[:3]:
+            with open(await cache.get(document), "rb") as file:
+                assert file.read() == stub.files[document.file_id][1]
+    finally:
+        api.close()
+        stub.close()
+        shutil.rmtree(directory)
+        await asyncio.sleep(0.1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Decodes a synthetic group chat trace (few chats, a few hundred active users) with and without IdentityCache,
+keeping a window of recent messages like a bot with per-chat history does.
+Reports decode time, memory of the window and garbage collections.
+
+Usage: python benchmarks/identity_cache.py [updates] [window]
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import decode_updates
+from bf_telegram.api.identity_cache import IdentityCache
+
+def trace(count):
+    random.seed(1)
+    chats = [{"id": -1001000000000 - i, "type": "supergroup", "title": f"Group {i}", "username": f"group{i}"}
+             for i in range(5)]
+    users = [{"id": 100000 + i, "is_bot": False, "first_name": f"User{i}", "last_name": "Petrov",
+              "username": f"user{i}", "language_code": random.choice(("en", "ru", "de"))} for i in range(300)]
+    # Every update arrives as freshly parsed JSON, so equal users and chats are separate dicts and strings
+    return [{"update_id": i,
+             "message": {"message_id": i,
+                         "from": {key: "".join(value) if type(value) is str else value
+                                  for key, value in random.choice(users).items()},
+                         "chat": {key: "".join(value) if type(value) is str else value
+                                  for key, value in random.choice(chats).items()},
+                         "date": 1680000000 + i,
+                         "text": "message text"}} for i in range(count)]
+
+def run(decode, updates, window):
+    recent = deque(maxlen=window)
+    gc.collect()
+    collections = sum(stats["collections"] for stats in gc.get_stats())
+    start = time.perf_counter()
+    for offset in range(0, len(updates), 100):
+        recent.extend(decode(updates[offset:offset + 100]))
+    seconds = time.perf_counter() - start
+    collections = sum(stats["collections"] for stats in gc.get_stats()) - collections
+    return seconds, collections, recent
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    window = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    updates = trace(count)
+    for name, decode in (("new objects", decode_updates), ("identity cache", IdentityCache().decode_updates)):
+        seconds, collections, recent = run(decode, updates, window)
+        del recent
+        tracemalloc.start()
+        _, _, recent = run(decode, updates[:window], window)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del recent
+        print(f"{name:>15}: {seconds / count * 1e6:6.2f} us/update, {collections:5d} collections, "
+              f"{size / window:6.0f} bytes/message in window")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Measures the cold import time of bf_telegram.api with python -X importtime in fresh interpreters,
+importing the package only, a single API type, the update decoder and every module.
+
+Usage: python benchmarks/import_time.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+STATEMENTS = {
+    "package": "import bf_telegram.api",
+    "Message": "from bf_telegram.api import Message",
+    "decoder": "from bf_telegram.api import decode_updates",
+    "BotApi": "from bf_telegram.api import BotApi",
+    "everything": "import bf_telegram.api as api; [getattr(api, name) for name in api.__all__]",
+}
+
+def import_time(statement):
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+    total = own = modules = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total += int(cumulative)
+        if name.strip().startswith("bf_telegram"):
+            own += int(self_time)
+            modules += 1
+    return total, own, modules
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    baseline = statistics.median(import_time("pass")[0] for _ in range(runs))
+    for name, statement in STATEMENTS.items():
+        results = [import_time(statement) for _ in range(runs)]
+        total = statistics.median(result[0] for result in results) - baseline
+        own = statistics.median(result[1] for result in results)
+        print(f"{name:>10}: {total / 1000:6.1f} ms total, {own / 1000:6.1f} ms in {results[0][2]} bf_telegram modules")
+
+if __name__ == "__main__":
+    main()
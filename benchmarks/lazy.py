@@ -0,0 +1,50 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Compares eager and lazy message decoding for a handler reading only text, chat.id and from_.id.
+
+Usage: python benchmarks/lazy.py [corpus.jsonl]
+
+The corpus is a recorded file with one JSON-serialized update per line.
+Synthetic updates from benchmarks/decode.py are used when it is omitted.
+"""
+
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import decode_updates
+from bf_telegram.api.lazy_message import decode_lazy_updates
+from decode import sample
+
+def handle(updates):
+    for update in updates:
+        message = update.message
+        if message is not None:
+            message.text, message.chat.id, message.from_ and message.from_.id_
+
+def load(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def main():
+    corpus = load(sys.argv[1]) if len(sys.argv) > 1 else [sample(i) for i in range(1, 5001)]
+    for name, decode in (("eager", decode_updates), ("lazy", decode_lazy_updates)):
+        decode(corpus[:1])
+        seconds = min(timeit.repeat(lambda: handle(decode(corpus)), number=1, repeat=5))
+        tracemalloc.start()
+        updates = decode(corpus)
+        handle(updates)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del updates
+        print(f"{name:>6}: {seconds / len(corpus) * 1e6:8.2f} us/update {size / len(corpus):10.0f} bytes/update")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Reports bytes per Message with a per-instance dict (the former layout) and with __slots__.
+
+Usage: python benchmarks/memory.py [messages]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.message import Message
+from bf_telegram.api.decoder import decode
+
+DictMessage = type("DictMessage", (), {"__init__": Message.__init__})
+
+def measure(build, count):
+    tracemalloc.start()
+    objects = [build(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (size - 8 * count) / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = "hello"
+    for name, build in (("__dict__", lambda i: DictMessage(i, text=text, date=i)),
+                        ("__slots__", lambda i: Message(i, text=text, date=i)),
+                        ("__slots__, decoded", lambda i: decode(Message, {"message_id": i, "text": text, "date": i}))):
+        print(f"{name:>18}: {measure(build, count):8.0f} bytes/message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Indexes messages of many chats with MessageIndex, half of them replies and a quarter in forum topics,
+and resolves reply chains and topic histories.
+
+Usage: python benchmarks/message_index.py [messages] [max_messages]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.chat import Chat
+from bf_telegram.api.message import Message
+from bf_telegram.api.message_index import MessageIndex
+
+CHATS = 1000
+
+def messages(count):
+    random.seed(1)
+    chats = [Chat(-1000000000000 - number, "supergroup") for number in range(CHATS)]
+    last = [[] for _ in range(CHATS)]
+    result = []
+    for message_id in range(1, count + 1):
+        number = random.randrange(CHATS)
+        recent = last[number]
+        parent = random.choice(recent) if recent and random.random() < 0.5 else None
+        thread_id = number % 4 + 1 if number % 4 == 0 else None
+        message = Message(message_id, chat=chats[number], text="text", message_thread_id=thread_id,
+                          reply_to_message=Message(parent.message_id, chat=parent.chat, text=parent.text)
+                          if parent is not None else None)
+        recent.append(message)
+        del recent[:-20]
+        result.append(message)
+    return result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    max_messages = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    sample = messages(count)
+    index = MessageIndex(max_messages)
+    start = time.perf_counter()
+    for message in sample:
+        index.put(message)
+    seconds = time.perf_counter() - start
+    print(f"put:    {count / seconds:10.0f} messages/s, {len(index)} indexed, {index.evicted} evicted")
+    recent = sample[-max_messages // 2:]
+    start = time.perf_counter()
+    depth = 0
+    for message in recent:
+        depth += len(index.chain(message.chat.id, message.message_id))
+    seconds = time.perf_counter() - start
+    print(f"chain:  {len(recent) / seconds:10.0f} chains/s, {depth / len(recent):.1f} messages/chain")
+    start = time.perf_counter()
+    found = 0
+    for message in recent:
+        found += index.get(message.chat.id, message.message_id) is not None
+    seconds = time.perf_counter() - start
+    print(f"get:    {len(recent) / seconds:10.0f} lookups/s, {found} found")
+    start = time.perf_counter()
+    topics = 0
+    for number in range(0, CHATS, 4):
+        topics += len(index.thread(-1000000000000 - number, 1))
+    seconds = time.perf_counter() - start
+    print(f"thread: {CHATS // 4 / seconds:10.0f} topics/s, {topics / (CHATS // 4):.1f} messages/topic")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Generates synthetic Bot API updates resembling recorded traffic: text messages with entities in mixed scripts,
+albums, forwarded messages, replies, channel posts, service messages and callback queries.
+
+Usage: python benchmarks/payloads.py [updates] [seed] > corpus.jsonl
+"""
+
+import json
+import random
+import sys
+
+KINDS = {
+    "text": 40,
+    "album": 10,
+    "forward": 10,
+    "reply": 10,
+    "channel_post": 10,
+    "service": 5,
+    "callback_query": 15,
+}
+"""
+Relative frequency of every kind of update. An album yields 2 to 10 updates.
+"""
+
+WORDS = ("hello", "world", "bot", "telegram", "update", "message", "привет", "мир", "сообщение", "чат", "día", "café",
+         "\U0001F600", "\U0001F44D", "\U0001F525", "ok", "thanks", "спасибо", "test", "why", "when")
+
+def _utf16_length(text):
+    return len(text) + sum(character > "￿" for character in text)
+
+class _Generator:
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.update_id = 100000000
+        self.message_ids = {}
+        self.users = [{"id": 100000000 + number, "is_bot": False, "first_name": f"User{number}",
+                       "username": f"user{number}", "language_code": self.random.choice(("en", "ru", "es"))}
+                      for number in range(500)]
+        self.groups = [{"id": -1001000000000 - number, "type": "supergroup", "title": f"Group {number}"}
+                       for number in range(50)]
+        self.channels = [{"id": -1002000000000 - number, "type": "channel", "title": f"Channel {number}",
+                          "username": f"channel{number}"} for number in range(10)]
+
+    def _update(self, **fields):
+        self.update_id += 1
+        return dict(update_id=self.update_id, **fields)
+
+    def _message(self, chat, user=None, **fields):
+        message_id = self.message_ids[chat["id"]] = self.message_ids.get(chat["id"], 0) + 1
+        message = {"message_id": message_id}
+        if user is not None:
+            message["from"] = user
+        message["chat"] = chat if chat["type"] != "private" else {
+            "id": user["id"], "type": "private", "first_name": user["first_name"], "username": user["username"]}
+        message["date"] = 1700000000 + self.update_id
+        message.update(fields)
+        return message
+
+    def _chat(self, user):
+        return self.random.choice(self.groups) if self.random.random() < 0.6 else {"id": user["id"], "type": "private"}
+
+    def _text(self, entity_count=None):
+        words = [self.random.choice(WORDS) for _ in range(self.random.randint(3, 60))]
+        if entity_count is None:
+            entity_count = self.random.choice((0, 0, 1, 2, 3, 5))
+        text = ""
+        entities = []
+        for index, word in enumerate(words):
+            if index < entity_count:
+                type_ = self.random.choice(("bold", "italic", "mention", "url", "hashtag", "text_link"))
+                word = {"mention": "@" + word, "url": "https://example.com/" + word, "hashtag": "#" + word}.get(type_,
+                                                                                                              word)
+                entity = {"type": type_, "offset": _utf16_length(text), "length": _utf16_length(word)}
+                if type_ == "text_link":
+                    entity["url"] = "https://example.org/"
+                entities.append(entity)
+            text += word + " "
+        if self.random.random() < 0.2:
+            command = "/" + self.random.choice(("start", "help", "settings", "stats")) + \
+                      self.random.choice(("", "@benchmark_bot"))
+            entities = [{"type": "bot_command", "offset": 0, "length": len(command)}] + \
+                       [dict(entity, offset=entity["offset"] + len(command) + 1) for entity in entities]
+            text = command + " " + text
+        return text.rstrip(), entities
+
+    def _photo(self):
+        file_id = "AgACAgIAAxkBAAI" + "".join(self.random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefgh0123456789")
+                                            for _ in range(40))
+        return [{"file_id": f"{file_id}{size}", "file_unique_id": f"AQAD{file_id[-8:]}{size}", "file_size": size * 97,
+                 "width": size, "height": size * 3 // 4} for size in (90, 320, 800, 1280)]
+
+    def text(self):
+        user = self.random.choice(self.users)
+        text, entities = self._text()
+        message = self._message(self._chat(user), user, text=text)
+        if entities:
+            message["entities"] = entities
+        return [self._update(message=message)]
+
+    def album(self):
+        user = self.random.choice(self.users)
+        chat = self._chat(user)
+        media_group_id = str(self.random.randrange(10 ** 17, 10 ** 18))
+        updates = []
+        for index in range(self.random.randint(2, 10)):
+            message = self._message(chat, user, media_group_id=media_group_id, photo=self._photo())
+            if index == 0:
+                message["caption"], entities = self._text(1)
+                message["caption_entities"] = entities
+            updates.append(self._update(message=message))
+        return updates
+
+    def forward(self):
+        user = self.random.choice(self.users)
+        channel = self.random.choice(self.channels)
+        text, entities = self._text()
+        message = self._message(self._chat(user), user, forward_from_chat=channel,
+                                forward_from_message_id=self.random.randint(1, 10000),
+                                forward_date=1690000000 + self.update_id, text=text)
+        if entities:
+            message["entities"] = entities
+        return [self._update(message=message)]
+
+    def reply(self):
+        user, other = self.random.sample(self.users, 2)
+        chat = self.random.choice(self.groups)
+        text, entities = self._text()
+        parent = self._message(chat, other, text=text)
+        if entities:
+            parent["entities"] = entities
+        if self.random.random() < 0.5:
+            parent["forward_from"] = self.random.choice(self.users)
+            parent["forward_date"] = 1690000000 + self.update_id
+        text, entities = self._text(0)
+        message = self._message(chat, user, reply_to_message=parent, text=text)
+        return [self._update(message=message)]
+
+    def channel_post(self):
+        channel = self.random.choice(self.channels)
+        text, entities = self._text(self.random.randint(0, 8))
+        post = self._message(channel, sender_chat=channel, author_signature="Editor")
+        if self.random.random() < 0.3:
+            post["photo"] = self._photo()
+            post["caption"] = text[:1024]
+        else:
+            post["text"] = text
+            if entities:
+                post["entities"] = entities
+        return [self._update(channel_post=post)]
+
+    def service(self):
+        user = self.random.choice(self.users)
+        chat = self.random.choice(self.groups)
+        kind = self.random.randrange(4)
+        if kind == 0:
+            message = self._message(chat, user, new_chat_members=[user])
+        elif kind == 1:
+            message = self._message(chat, user, left_chat_member=user)
+        elif kind == 2:
+            message = self._message(chat, user, new_chat_title=f"{chat['title']} renamed")
+        else:
+            text, _ = self._text(0)
+            pinned = self._message(chat, user, text=text)
+            message = self._message(chat, user, pinned_message=pinned)
+        return [self._update(message=message)]
+
+    def callback_query(self):
+        user = self.random.choice(self.users)
+        chat = {"id": user["id"], "type": "private", "first_name": user["first_name"], "username": user["username"]}
+        text, _ = self._text(0)
+        message = {"message_id": self.random.randint(1, 10000), "from": {"id": 5000000000, "is_bot": True,
+                                                                         "first_name": "Benchmark",
+                                                                         "username": "benchmark_bot"},
+                   "chat": chat, "date": 1700000000 + self.update_id, "text": text,
+                   "reply_markup": {"inline_keyboard": [[{"text": "Yes", "callback_data": "yes"},
+                                                         {"text": "No", "callback_data": "no"}]]}}
+        return [self._update(callback_query={"id": str(self.random.getrandbits(63)), "from": user, "message": message,
+                                             "chat_instance": str(self.random.getrandbits(63)),
+                                             "data": self.random.choice(("yes", "no"))})]
+
+def generate(count, seed=1):
+    """
+    Generates updates.
+
+    :param count: Number of updates
+    :param seed: Seed of the random generator, the same seed gives the same updates
+    :return: Decoded JSON objects of the updates, in update_id order
+    """
+    generator = _Generator(seed)
+    kinds = list(KINDS)
+    weights = list(KINDS.values())
+    updates = []
+    while len(updates) < count:
+        updates += getattr(generator, generator.random.choices(kinds, weights)[0])()
+    return updates[:count]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    for update in generate(count, seed):
+        sys.stdout.write(json.dumps(update, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Measures the overhead of Pipeline over calling the same decode, dedupe, route, handle and send stages directly,
+and prints the exported metrics.
+
+Usage: python benchmarks/pipeline.py [updates]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import decoder
+from bf_telegram.api.pipeline import Pipeline
+from bf_telegram.api.update import Update
+
+from decode import sample
+
+decode = decoder(Update)
+seen = set()
+
+def dedupe(update):
+    if update.update_id in seen:
+        return None
+    seen.add(update.update_id)
+    return update
+
+def route(update):
+    return update if update.message is not None else None
+
+async def handle(update):
+    return update.message.text or ""
+
+async def send(text):
+    return len(text)
+
+async def direct(data):
+    update = dedupe(decode(data))
+    if update is None:
+        return None
+    update = route(update)
+    if update is None:
+        return None
+    return await send(await handle(update))
+
+async def run(function, updates):
+    seen.clear()
+    start = time.perf_counter()
+    for data in updates:
+        await function(data)
+    return (time.perf_counter() - start) / len(updates)
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    updates = [sample(update_id) for update_id in range(count)]
+    pipeline = Pipeline([("decode", decode), ("dedupe", dedupe), ("route", route), ("handle", handle),
+                         ("send", send)])
+    results = {}
+    for _ in range(3):
+        for name, function in (("direct", direct), ("Pipeline", pipeline.put)):
+            results[name] = min(results.get(name, 1), await run(function, updates))
+    for name, seconds in results.items():
+        print(f"{name:>8}: {seconds * 1e6:6.2f} us/update")
+    print(f"overhead: {(results['Pipeline'] - results['direct']) * 1e6:6.2f} us/update")
+    print()
+    print(pipeline.metrics(), end="")
+
+if __name__ == "__main__":
+    asyncio.run(main())
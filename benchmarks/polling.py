@@ -0,0 +1,105 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Drains a queue of updates from a local stub Bot API server with LongPolling.
+Reports updates per second, updates per request and the time the server spent without a pending getUpdates request.
+
+Then checks that the next getUpdates request reaches a stub server running on another thread before a batch is
+handled by a handler that never suspends; the exit status is 1 if it does not.
+
+Usage: python benchmarks/polling.py [updates]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.bot_api import BotApi
+from bf_telegram.api.long_polling import LongPolling
+from decode import sample
+from stub_bot_api import StubBotApi
+
+async def benchmark(count):
+    server = StubBotApi()
+    api = BotApi("123:stub", await server.start())
+    server.push([sample(i) for i in range(1, count + 1)])
+    handled = 0
+
+    async def handler(update):
+        nonlocal handled
+        handled += 1
+        if handled == count:
+            polling.stop()
+
+    polling = LongPolling(api, handler, timeout=1)
+    start = time.perf_counter()
+    await polling.run()
+    seconds = time.perf_counter() - start
+    api.close()
+    await asyncio.sleep(0.1)
+    server.close()
+    print(f"{count / seconds:10.0f} updates/s")
+    print(f"{count / server.polls:10.1f} updates/request")
+    print(f"{server.idle / max(server.polls - 1, 1) * 1e6:10.1f} us idle between requests")
+
+async def pipelined(count=100, seconds_per_update=0.001):
+    """
+    Handles a batch with a handler blocking the event loop, while the stub server runs on its own thread and loop.
+
+    :return: Whether the next getUpdates request reached the server before the batch was handled
+    """
+    server = StubBotApi()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    url = None
+
+    def serve():
+        nonlocal url
+        url = loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    started.wait()
+    loop.call_soon_threadsafe(server.push, [sample(i) for i in range(1, count + 1)])
+    api = BotApi("123:stub", url)
+    handled = 0
+    handled_at = None
+
+    async def handler(update):
+        nonlocal handled, handled_at
+        time.sleep(seconds_per_update)
+        handled += 1
+        if handled == count:
+            handled_at = time.perf_counter()
+            polling.stop()
+
+    polling = LongPolling(api, handler, timeout=1)
+    await polling.run()
+    api.close()
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    return len(server.poll_times) > 1 and server.poll_times[1] < handled_at
+
+def main():
+    asyncio.run(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
+    if not asyncio.run(pipelined()):
+        print("Next getUpdates request sent only after the batch was handled")
+        sys.exit(1)
+    print("Next getUpdates request sent while the batch was handled")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Simulates a broadcast to one big group mixed with replies to private chats through Sender,
+against a local stub Bot API server answering 429 when Telegram's limits (scaled by SCALE) are exceeded.
+Reports throughput, 429 responses and private chat latency.
+
+Usage: python benchmarks/rate_limits.py [private chats] [group messages]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.bot_api import BotApi
+from bf_telegram.api.sender import Sender
+from stub_bot_api import StubBotApi, StubError
+
+SCALE = 10
+GLOBAL_RATE = 30 * SCALE
+CHAT_RATE = 1 * SCALE
+GROUP_RATE = 20 / 60 * SCALE
+
+class LimitedServer(StubBotApi):
+    def __init__(self):
+        super().__init__()
+        self.methods["sendMessage"] = self.send_message
+        self.rejected = 0
+        self._global = deque()
+        self._chats = {}
+
+    async def send_message(self, parameters):
+        now = time.monotonic()
+        chat_id = parameters["chat_id"]
+        while self._global and self._global[0] <= now - 1:
+            self._global.popleft()
+        rate = GROUP_RATE if chat_id < 0 else CHAT_RATE
+        last = self._chats.get(chat_id)
+        if len(self._global) >= GLOBAL_RATE * 1.1 or (last is not None and now - last < 0.9 / rate):
+            self.rejected += 1
+            raise StubError(429, "Too Many Requests: retry after 1", retry_after=1)
+        self._global.append(now)
+        self._chats[chat_id] = now
+        return {"message_id": len(self._global), "chat": {"id": chat_id}, "date": int(time.time())}
+
+async def main():
+    private_chats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    group_messages = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    server = LimitedServer()
+    api = BotApi("123:stub", await server.start(), max_connections=64)
+    sender = Sender(api, GLOBAL_RATE, CHAT_RATE, GROUP_RATE)
+    sender.start()
+    latencies = []
+
+    async def send(chat_id, text):
+        start = time.perf_counter()
+        await sender.call("sendMessage", {"chat_id": chat_id, "text": text})
+        if chat_id > 0:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    requests = [send(-100123, f"announcement {i}") for i in range(group_messages)]
+    requests += [send(chat_id, f"reply {i}") for i in range(3) for chat_id in range(1, private_chats + 1)]
+    await asyncio.gather(*requests)
+    seconds = time.perf_counter() - start
+    sender.stop()
+    api.close()
+    await asyncio.sleep(0.1)
+    server.close()
+    latencies.sort()
+    print(f"{len(requests) / seconds:10.1f} messages/s ({GLOBAL_RATE} allowed), {server.rejected} answered with 429")
+    print(f"{latencies[len(latencies) // 2]:10.2f} s median, {latencies[len(latencies) * 99 // 100]:.2f} s p99 private chat latency")
+    print(f"{seconds:10.2f} s total, group limit alone needs {(group_messages - 1) / GROUP_RATE:.2f} s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
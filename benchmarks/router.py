@@ -0,0 +1,61 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Matches command messages with Router and with a chain of comparisons scanning the entities of every message.
+
+Usage: python benchmarks/router.py [commands]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.chat import Chat
+from bf_telegram.api.message import Message
+from bf_telegram.api.message_entity import MessageEntity
+from bf_telegram.api.router import Router
+
+async def handle(message, text):
+    pass
+
+def messages(commands):
+    random.seed(1)
+    result = []
+    for _ in range(1000):
+        command = "/" + random.choice(commands) + random.choice(("", "@benchmark_bot"))
+        result.append(Message(1, chat=Chat(1, random.choice(("private", "group"))), text=command + " argument",
+                              entities=[MessageEntity("bot_command", 0, len(command))]))
+    return result
+
+def naive(message, routes):
+    for entity in message.entities:
+        if entity.type == "bot_command" and entity.offset == 0:
+            command = message.text.encode("utf-16-le")[:entity.length * 2].decode("utf-16-le")[1:]
+            command = command.split("@")[0].lower()
+            for name, chat_types, handler in routes:
+                if command == name and (chat_types is None or message.chat.type in chat_types):
+                    return handler, message.text[len(command) + 1:].strip()
+    return None
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    commands = [f"command{number}" for number in range(count)]
+    router = Router("benchmark_bot")
+    routes = []
+    for number, command in enumerate(commands):
+        chat_types = ("private",) if number % 2 else None
+        router.command(command, handle, chat_types)
+        routes.append((command, chat_types, handle))
+    sample = messages(commands)
+    for name, function in (("if-chain", lambda: [naive(message, routes) for message in sample]),
+                           ("Router", lambda: [router.match(message) for message in sample])):
+        seconds = min(timeit.repeat(function, number=5, repeat=5)) / 5 / len(sample)
+        print(f"{count} commands, {name:>8}: {seconds * 1e6:7.2f} us/message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Minimal local Bot API server for benchmarks.
+Serves getUpdates from an in-memory queue and getFile and file downloads from in-memory files,
+other methods are served by registered coroutine functions.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.http_connection import HttpError, read_body, read_headers
+
+class StubBotApi:
+    def __init__(self):
+        self.updates: list[dict] = []
+        self.methods: dict[str, Callable[[dict], Awaitable[Any]]] = {"getUpdates": self.get_updates,
+                                                                     "getFile": self.get_file}
+        self.files: dict[str, tuple[str, bytes]] = {}
+        self.requests = 0
+        self.downloads = 0
+        self.polls = 0
+        self.poll_times: list[float] = []
+        self.idle = 0.0
+        self._idle_since = time.perf_counter()
+        self._new_updates = asyncio.Event()
+        self._server = None
+
+    def push(self, updates: list[dict]):
+        self.updates.extend(updates)
+        self._new_updates.set()
+
+    async def get_updates(self, parameters: dict) -> list[dict]:
+        offset = parameters.get("offset") or 0
+        self.updates = [update for update in self.updates if update["update_id"] >= offset]
+        if not self.updates and parameters.get("timeout"):
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), parameters["timeout"])
+            except asyncio.TimeoutError:
+                pass
+        return self.updates[:parameters.get("limit") or 100]
+
+    def add_file(self, file_id: str, file_unique_id: str, content: bytes):
+        self.files[file_id] = (file_unique_id, content)
+
+    async def get_file(self, parameters: dict) -> dict:
+        try:
+            file_unique_id, content = self.files[parameters["file_id"]]
+        except KeyError:
+            raise StubError(400, "Bad Request: invalid file_id") from None
+        return {"file_id": parameters["file_id"], "file_unique_id": file_unique_id, "file_size": len(content),
+                "file_path": f"documents/{parameters['file_id']}"}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return "http://%s:%d" % self._server.sockets[0].getsockname()[:2]
+
+    def close(self):
+        self._server.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                headers = await read_headers(reader)
+                body = await read_body(reader, headers)
+                target = line.split()[1].decode()
+                if target.startswith("/file/bot"):
+                    await self._download(target, writer)
+                    continue
+                method = target.rsplit("/", 1)[1]
+                parameters = json.loads(body) if body else {}
+                self.requests += 1
+                if method == "getUpdates":
+                    self.polls += 1
+                    self.poll_times.append(time.perf_counter())
+                    if self.polls > 1:
+                        self.idle += time.perf_counter() - self._idle_since
+                try:
+                    response = {"ok": True, "result": await self.methods[method](parameters)}
+                except KeyError:
+                    response = {"ok": False, "error_code": 404, "description": "Not Found"}
+                except StubError as error:
+                    response = error.response
+                if method == "getUpdates":
+                    self._idle_since = time.perf_counter()
+                payload = json.dumps(response).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n"
+                             % len(payload) + payload)
+                await writer.drain()
+        except (HttpError, ConnectionError, asyncio.CancelledError):
+            # Also ends a handler cancelled on shutdown, which the stream server would report as an error
+            pass
+        finally:
+            writer.close()
+
+    async def _download(self, target: str, writer: asyncio.StreamWriter):
+        file = self.files.get(target.rsplit("/", 1)[1])
+        if file is None:
+            payload = json.dumps({"ok": False, "error_code": 404, "description": "Not Found"}).encode()
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: %d\r\n\r\n" % len(payload) + payload)
+        else:
+            self.downloads += 1
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(file[1]))
+            writer.write(file[1])
+        await writer.drain()
+
+class StubError(Exception):
+    def __init__(self, error_code: int, description: str, **parameters):
+        super().__init__(description)
+        self.response = {"ok": False, "error_code": error_code, "description": description}
+        if parameters:
+            self.response["parameters"] = parameters
@@ -0,0 +1,208 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Runs the API object layer benchmarks on updates generated by payloads.py, or on a recorded corpus,
+and compares the results with a stored baseline.
+
+Every benchmark reports operations per second and, where it builds objects, bytes retained per object.
+A benchmark regresses when its rate drops or its size grows by more than the threshold relative to the baseline,
+in which case the exit status is 1. Rates vary by several percent between runs on a busy machine, while sizes are
+exact, so a lower threshold is only meaningful on a quiet one. The stored baseline was measured on one machine;
+save a new one with --save before comparing changes on another. Saving some benchmarks only updates their results,
+and is refused if the others were measured on another corpus or Python version.
+
+Usage: python benchmarks/suite.py [--updates N] [--corpus corpus.jsonl] [--threshold 0.25] [--save] [benchmark ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.chat import Chat
+from bf_telegram.api.decoder import decode_updates
+from bf_telegram.api.dispatcher import Dispatcher
+from bf_telegram.api.encoder import encode
+from bf_telegram.api.entity_text import entities
+from bf_telegram.api.lazy_message import decode_lazy_updates
+from bf_telegram.api.message import Message
+from bf_telegram.api.message_entity import MessageEntity
+from bf_telegram.api.router import Router
+from bf_telegram.api.update import Update
+from bf_telegram.api.user import User
+
+from lazy import handle, load
+from payloads import generate
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+RETRIES = 2
+
+def _messages(updates):
+    return [message for update in updates
+            if (message := update.message or update.channel_post) is not None]
+
+def _arguments(corpus):
+    # Constructor arguments of the text messages, with nested objects built at run time too
+    result = []
+    for data in corpus:
+        message = data.get("message")
+        if message is None or "text" not in message or "from" not in message:
+            continue
+        user = message["from"]
+        chat = message["chat"]
+        result.append((data["update_id"], message["message_id"], message["date"], message["text"],
+                       (user["id"], user["is_bot"], user["first_name"], user.get("last_name"), user.get("username")),
+                       (chat["id"], chat["type"], chat.get("title")),
+                       [(entity["type"], entity["offset"], entity["length"]) for entity in message.get("entities", ())]))
+    return result
+
+def construct(arguments):
+    return [Update(update_id, message=Message(message_id, from_=User(*user), date=date, chat=Chat(*chat), text=text,
+                                              entities=[MessageEntity(*entity) for entity in message_entities]
+                                              if message_entities else None))
+            for update_id, message_id, date, text, user, chat, message_entities in arguments]
+
+def decode_lazy(corpus):
+    updates = decode_lazy_updates(corpus)
+    handle(updates)
+    return updates
+
+async def _noop(*args):
+    pass
+
+def dispatch(updates):
+    async def run():
+        dispatcher = Dispatcher(_noop, workers=16, max_pending=len(updates) + 1, max_chat_pending=len(updates) + 1)
+        dispatcher.start()
+        for update in updates:
+            await dispatcher.put(update)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+
+def benchmarks(corpus):
+    """
+    Prepares the benchmarks.
+
+    :param corpus: Decoded JSON objects of updates
+    :return: Name, function and number of operations per call, and whether its result is kept for measuring bytes
+             per object, of every benchmark
+    """
+    updates = decode_updates(corpus)
+    messages = _messages(updates)
+    with_entities = [message for message in messages if message.entities or message.caption_entities]
+    entity_count = sum(len(message.entities or ()) + len(message.caption_entities or ()) for message in with_entities)
+    arguments = _arguments(corpus)
+    router = Router("benchmark_bot")
+    for command in ("start", "help", "settings", "stats"):
+        router.command(command, _noop)
+    return [
+        ("construct", lambda: construct(arguments), len(arguments), True),
+        ("decode", lambda: decode_updates(corpus), len(corpus), True),
+        ("decode_lazy", lambda: decode_lazy(corpus), len(corpus), True),
+        ("encode", lambda: [encode(update) for update in updates], len(updates), False),
+        ("entities", lambda: [list(entities(message)) for message in with_entities], entity_count, False),
+        ("route", lambda: [router.match(message) for message in messages], len(messages), False),
+        ("dispatch", lambda: dispatch(updates), len(updates), False),
+    ]
+
+def measure(function, count, retained, repeat):
+    """
+    Runs a benchmark.
+
+    :return: Operations per second and bytes retained per object, None if the result is not kept
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()  # Calls per run taking at least 0.2 seconds
+    seconds = min(timer.repeat(repeat, number)) / number
+    size = None
+    if retained:
+        tracemalloc.start()
+        result = function()
+        size = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+        del result
+    return count / seconds, size
+
+def compare(name, result, baseline, threshold):
+    """
+    Compares a result with the baseline.
+
+    :return: Description of the changes and whether the result regressed
+    """
+    reference = baseline.get(name)
+    if reference is None:
+        return "no baseline", False
+    ops = result["ops_per_second"] / reference["ops_per_second"] - 1
+    changes = [f"{ops:+6.1%} ops/s"]
+    regressed = ops < -threshold
+    if result["bytes_per_object"] is not None and reference.get("bytes_per_object"):
+        size = result["bytes_per_object"] / reference["bytes_per_object"] - 1
+        changes.append(f"{size:+6.1%} bytes")
+        regressed |= size > threshold
+    return ", ".join(changes), regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="benchmark", help="benchmarks to run, all by default")
+    parser.add_argument("--updates", type=int, default=10000, help="number of generated updates")
+    parser.add_argument("--corpus", help="JSON Lines file of recorded updates to use instead of generated ones")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the fastest is reported")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative change counted as a regression")
+    parser.add_argument("--save", action="store_true", help="store the results in the baseline")
+    options = parser.parse_args()
+    corpus = load(options.corpus) if options.corpus else generate(options.updates)
+    metadata = {"updates": len(corpus), "corpus": options.corpus, "python": sys.version.split()[0]}
+    stored = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline, encoding="utf-8") as file:
+            saved = json.load(file)
+        stored = saved["results"]
+        kept = set(stored) - set(options.names or stored)
+        if options.save and kept and any(saved.get(key) != value for key, value in metadata.items()):
+            # The kept results would be stored as if measured on this corpus and Python version
+            parser.error(f"the baseline of {', '.join(sorted(kept))} was measured on another corpus or Python "
+                         f"version, run all benchmarks to save a new one")
+    baseline = {} if options.save else stored
+    results = {}
+    regressions = []
+    for name, function, count, retained in benchmarks(corpus):
+        if options.names and name not in options.names:
+            continue
+        start = time.perf_counter()
+        for attempt in range(RETRIES + 1):
+            # A regression is measured again, as a single slow measurement is usually another process running
+            attempt_ops, size = measure(function, count, retained, options.repeat)
+            ops = max(ops, attempt_ops) if attempt else attempt_ops
+            results[name] = {"ops_per_second": round(ops),
+                             "bytes_per_object": round(size) if size is not None else None}
+            changes, regressed = compare(name, results[name], baseline, options.threshold)
+            if not regressed:
+                break
+        if regressed:
+            regressions.append(name)
+        size = f"{size:8.0f} B/object" if size is not None else " " * 17
+        print(f"{name:>12}: {ops:12,.0f} ops/s {size}  {changes}{'  REGRESSION' if regressed else ''}"
+              f"  ({time.perf_counter() - start:.1f} s)")
+    if options.save:
+        # Benchmarks not run keep their stored results
+        stored.update(results)
+        with open(options.baseline, "w", encoding="utf-8") as file:
+            json.dump(dict(metadata, results=stored), file, indent=2)
+            file.write("\n")
+        print(f"Saved baseline to {options.baseline}")
+    if regressions:
+        print(f"Regressed by more than {options.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Writes updates to an update log and replays them: raw records, decoded updates, decoded updates through a Dispatcher
+and the last percent of the log found by update_id. JSON lines are written and read for comparison.
+
+Usage: python benchmarks/update_log.py [updates]
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.decoder import decoder
+from bf_telegram.api.dispatcher import Dispatcher
+from bf_telegram.api.update import Update
+from bf_telegram.api.update_log import UpdateLogReader, UpdateLogWriter
+from decode import sample
+
+def report(name, count, seconds, size=None):
+    line = f"{name:>18}: {count / seconds:9.0f} updates/s"
+    if size is not None:
+        line += f", {size / count:5.0f} bytes/update"
+    print(line)
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+async def dispatch(reader):
+    async def handle(update):
+        pass
+
+    dispatcher = Dispatcher(handle)
+    dispatcher.start()
+    for update in reader.updates():
+        await dispatcher.put(update)
+    await dispatcher.stop()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    corpus = [sample(i) for i in range(1, count + 1)]
+    directory = tempfile.mkdtemp()
+    try:
+        lines = os.path.join(directory, "updates.jsonl")
+        started = time.perf_counter()
+        with open(lines, "w", encoding="utf-8") as file:
+            for update in corpus:
+                file.write(json.dumps(update, ensure_ascii=False) + "\n")
+        report("write JSON lines", count, time.perf_counter() - started, os.path.getsize(lines))
+
+        log = os.path.join(directory, "log")
+        started = time.perf_counter()
+        with UpdateLogWriter(log) as writer:
+            writer.extend(corpus)
+        report("write log", count, time.perf_counter() - started, directory_size(log))
+
+        decode = decoder(Update)
+        started = time.perf_counter()
+        with open(lines, encoding="utf-8") as file:
+            for line in file:
+                decode(json.loads(line))
+        report("read JSON lines", count, time.perf_counter() - started)
+
+        with UpdateLogReader(log) as reader:
+            started = time.perf_counter()
+            for _ in reader.records():
+                pass
+            report("replay records", count, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for _ in reader.updates():
+                pass
+            report("replay updates", count, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            asyncio.run(dispatch(reader))
+            report("replay dispatcher", count, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            tail = sum(1 for _ in reader.updates(count - count // 100))
+            seconds = time.perf_counter() - started
+            print(f"{'last 1% by id':>18}: {seconds * 1000:9.2f} ms for {tail} updates")
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Uploads files concurrently with sendDocument to a local server discarding the uploads, reading every file into memory
+and streaming it with InputFile, and reports peak memory allocated by Python. Then repeats the uploads through
+an UploadCache.
+
+Usage: python benchmarks/upload.py [concurrent uploads] [file size in MiB]
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.bot_api import BotApi
+from bf_telegram.api.http_connection import read_headers
+from bf_telegram.api.input_file import InputFile
+from bf_telegram.api.upload_cache import UploadCache
+
+class Sink:
+    def __init__(self):
+        self.received = 0
+        self._file_ids = itertools.count()
+
+    async def serve(self, reader, writer):
+        try:
+            while await reader.readline():
+                size = int((await read_headers(reader))["content-length"])
+                while size > 0:
+                    chunk = await reader.read(min(size, 1 << 16))
+                    if not chunk:
+                        return
+                    size -= len(chunk)
+                    self.received += len(chunk)
+                payload = json.dumps({"ok": True, "result": {"message_id": 1, "document": {
+                    "file_id": f"file{next(self._file_ids)}", "file_unique_id": "unique"}}}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(payload) + payload)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def measure(name, upload, paths):
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    await asyncio.gather(*map(upload, paths))
+    seconds = time.perf_counter() - started
+    print(f"{name:>10}: {seconds:6.2f} s, peak {tracemalloc.get_traced_memory()[1] / (1 << 20):7.1f} MiB")
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    size = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) << 20
+    directory = tempfile.mkdtemp()
+    paths = []
+    for number in range(count):
+        paths.append(os.path.join(directory, f"video{number}.mp4"))
+        with open(paths[-1], "wb") as file:
+            file.write(os.urandom(size))
+    sink = Sink()
+    server = await asyncio.start_server(sink.serve, "127.0.0.1", 0)
+    api = BotApi("123:token", "http://%s:%d" % server.sockets[0].getsockname()[:2], timeout=300)
+    try:
+        async def read(path):
+            with open(path, "rb") as file:
+                await api.call("sendDocument", {"chat_id": 1, "document": InputFile(file.read(), "video.mp4")})
+
+        async def stream(path):
+            await api.call("sendDocument", {"chat_id": 1, "document": InputFile(path)})
+
+        cache = UploadCache(api)
+
+        async def cached(path):
+            await cache.call("sendDocument", {"chat_id": 1, "document": InputFile(path)})
+
+        tracemalloc.start()
+        await measure("read", read, paths)
+        await measure("InputFile", stream, paths)
+        await measure("uncached", cached, paths)
+        received = sink.received
+        await measure("cached", cached, paths)
+        print(f"cache hits {cache.hits}, uploads {cache.uploads}, {sink.received - received} bytes sent while cached")
+    finally:
+        api.close()
+        server.close()
+        await asyncio.sleep(0.1)
+        for path in paths:
+            os.remove(path)
+        os.rmdir(directory)
+
+if __name__ == "__main__":
+    asyncio.run(main())
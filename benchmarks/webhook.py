@@ -0,0 +1,63 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Load test of WebhookServer: 100 concurrent keep-alive connections deliver updates like Telegram does,
+while the handler takes a millisecond per update.
+Reports acknowledged deliveries per second and acknowledgement latency.
+
+Usage: python benchmarks/webhook.py [updates] [connections]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bf_telegram.api.http_connection import HttpConnection
+from bf_telegram.api.webhook_server import WebhookServer
+from decode import sample
+
+SECRET = "benchmark-secret"
+
+async def deliver(port, bodies, latencies, statuses):
+    connection = HttpConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": SECRET}
+    for body in bodies:
+        start = time.perf_counter()
+        response = await connection.request("POST", "/webhook", body, headers)
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+    connection.close()
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    handled = 0
+
+    async def handler(update):
+        nonlocal handled
+        await asyncio.sleep(0.001)
+        handled += 1
+
+    server = WebhookServer(handler, SECRET, "/webhook", queue_size=count, workers=8)
+    await server.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    bodies = [json.dumps(sample(i)).encode() for i in range(1, count + 1)]
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(deliver(port, bodies[i::connections], latencies, statuses) for i in range(connections)))
+    seconds = time.perf_counter() - start
+    await server.stop()
+    latencies.sort()
+    print(f"{count / seconds:10.0f} deliveries/s over {connections} connections, statuses {statuses}")
+    print(f"{latencies[len(latencies) // 2] * 1e3:10.2f} ms median, {latencies[len(latencies) * 99 // 100] * 1e3:.2f} ms p99")
+    print(f"{handled:10d} updates handled")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,120 @@
 #  This Source Code Form is subject to the terms of the Mozilla Public
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Telegram Bot API types and client.
+
+Names are imported from their modules on first access, so importing the package is cheap and using an API type
+does not load the networking modules.
+"""
+
+TYPE_CHECKING = False  # Avoids importing typing, recognized by type checkers
+
+_MODULES = {
+    "TelegramObject": "telegram_object",
+    "User": "user",
+    "Chat": "chat",
+    "MessageEntity": "message_entity",
+    "MessageId": "message_id",
+    "PhotoSize": "photo_size",
+    "Animation": "animation",
+    "Audio": "audio",
+    "Document": "document",
+    "Video": "video",
+    "VideoNote": "video_note",
+    "Message": "message",
+    "File": "file",
+    "WebhookInfo": "webhook_info",
+    "Update": "update",
+    "InputFile": "input_file",
+    "decode": "decoder",
+    "decode_list": "decoder",
+    "decode_updates": "decoder",
+    "encode": "encoder",
+    "UpdateColumns": "columnar",
+    "decode_columns": "columnar",
+    "LazyMessage": "lazy_message",
+    "decode_lazy_updates": "lazy_message",
+    "IdentityCache": "identity_cache",
+    "ChatStore": "chat_store",
+    "MigrationTracker": "migrations",
+    "MessageIndex": "message_index",
+    "EntityText": "entity_text",
+    "PhotoSizes": "photo_sizes",
+    "HttpError": "http_connection",
+    "BotApi": "bot_api",
+    "BotApiError": "bot_api",
+    "LongPolling": "long_polling",
+    "WebhookServer": "webhook_server",
+    "UpdateSequencer": "update_sequencer",
+    "UpdateLogWriter": "update_log",
+    "UpdateLogReader": "update_log",
+    "Dispatcher": "dispatcher",
+    "Router": "router",
+    "Pipeline": "pipeline",
+    "Histogram": "histogram",
+    "MediaGroupAggregator": "media_group",
+    "Sender": "sender",
+    "Broadcast": "broadcast",
+    "FileCache": "file_cache",
+    "UploadCache": "upload_cache",
+}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name: str):
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # Unlike importlib.import_module, __import__ shows up in python -X importtime
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=(name,)), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+if TYPE_CHECKING:
+    from .telegram_object import TelegramObject
+    from .user import User
+    from .chat import Chat
+    from .message_entity import MessageEntity
+    from .message_id import MessageId
+    from .photo_size import PhotoSize
+    from .animation import Animation
+    from .audio import Audio
+    from .document import Document
+    from .video import Video
+    from .video_note import VideoNote
+    from .message import Message
+    from .file import File
+    from .webhook_info import WebhookInfo
+    from .update import Update
+    from .input_file import InputFile
+    from .decoder import decode, decode_list, decode_updates
+    from .encoder import encode
+    from .columnar import UpdateColumns, decode_columns
+    from .lazy_message import LazyMessage, decode_lazy_updates
+    from .identity_cache import IdentityCache
+    from .chat_store import ChatStore
+    from .migrations import MigrationTracker
+    from .message_index import MessageIndex
+    from .entity_text import EntityText
+    from .photo_sizes import PhotoSizes
+    from .http_connection import HttpError
+    from .bot_api import BotApi, BotApiError
+    from .long_polling import LongPolling
+    from .webhook_server import WebhookServer
+    from .update_sequencer import UpdateSequencer
+    from .update_log import UpdateLogReader, UpdateLogWriter
+    from .dispatcher import Dispatcher
+    from .router import Router
+    from .pipeline import Pipeline
+    from .histogram import Histogram
+    from .media_group import MediaGroupAggregator
+    from .sender import Sender
+    from .broadcast import Broadcast
+    from .file_cache import FileCache
+    from .upload_cache import UploadCache
@@ -2,17 +2,30 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-from photo_size import PhotoSize
+from .telegram_object import TelegramObject
+from .photo_size import PhotoSize
 
-class Audio:
+class Audio(TelegramObject):
     """
     This object represents an audio file to be treated as music by the Telegram clients.
 
     https://core.telegram.org/bots/api#audio
     """
 
+    __slots__ = ("file_id",
+                 "file_unique_id",
+                 "duration",
+                 "performer",
+                 "title",
+                 "file_name",
+                 "mime_type",
+                 "file_size",
+                 "thumb")
+
     def __init__(self,
                  file_id: str,
                  file_unique_id: str,
@@ -0,0 +1,192 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+from collections import deque
+from typing import Any, Callable, Iterable, Optional, Union
+from urllib.parse import quote, urlsplit
+
+from .http_connection import HttpConnection, HttpError, HttpResponse
+from .encoder import encode
+from .input_file import InputFile, MultipartBody
+
+class BotApiError(Exception):
+    """
+    Raised when the Bot API answers a request with "ok": false.
+    """
+
+    def __init__(self, method: str, error_code: int, description: str, parameters: Optional[dict] = None):
+        """
+        :param method: Name of the called method
+        :param error_code: Error code, usually an HTTP status
+        :param description: Human-readable description of the error
+        :param parameters: ResponseParameters object explaining how the request can be retried (retry_after, migrate_to_chat_id)
+        """
+        super().__init__(f"{method}: [{error_code}] {description}")
+        self.method = method
+        self.error_code = error_code
+        self.description = description
+        self.parameters = parameters or {}
+
+    @property
+    def retry_after(self) -> Optional[int]:
+        """
+        In case of exceeding flood control, the number of seconds left to wait before the request can be repeated.
+        """
+        return self.parameters.get("retry_after")
+
+    @property
+    def migrate_to_chat_id(self) -> Optional[int]:
+        """
+        The group has been migrated to a supergroup with the specified identifier.
+        """
+        return self.parameters.get("migrate_to_chat_id")
+
+class BotApi:
+    """
+    Bot API client keeping a pool of persistent HTTP connections.
+
+    https://core.telegram.org/bots/api#making-requests
+    """
+
+    def __init__(self,
+                 token: str,
+                 base_url: str = "https://api.telegram.org",
+                 max_connections: int = 16,
+                 timeout: float = 30):
+        """
+        :param token: Bot token
+        :param base_url: Bot API server, e.g. a local Bot API server or a stub used in tests
+        :param max_connections: Maximum number of simultaneously open connections
+        :param timeout: Time limit of a request in seconds, long polling requests get their polling timeout on top
+        """
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl_context = ssl.create_default_context() if url.scheme == "https" else None
+        self.path = f"{url.path.rstrip('/')}/bot{token}/"
+        self.file_path = f"{url.path.rstrip('/')}/file/bot{token}/"
+        self.timeout = timeout
+        self._idle: deque[HttpConnection] = deque()
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def call(self, method: str, parameters: Optional[dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Calls a Bot API method with JSON-serialized parameters, which may contain API objects.
+        None-valued parameters are omitted. If a parameter is an InputFile, the parameters are sent as
+        multipart/form-data, streaming the file.
+
+        :param method: Method name, e.g. "getUpdates"
+        :param parameters: Method parameters
+        :param timeout: Time limit of the request in seconds, defaults to the client timeout
+        :return: The decoded "result" field of the response
+        """
+        parameters = parameters or {}
+        if any(isinstance(value, InputFile) for value in parameters.values()):
+            body = MultipartBody({name: value if isinstance(value, (str, InputFile)) else encode(value).decode()
+                                  for name, value in parameters.items() if value is not None})
+            headers = {"Content-Type": body.content_type}
+        else:
+            body = encode(parameters)
+            headers = {"Content-Type": "application/json"}
+        response = await self.request("POST", method, body, headers, timeout)
+        return self.result(method, response.body)
+
+    async def request(self,
+                      http_method: str,
+                      method: str,
+                      body: Union[bytes, Iterable[bytes]] = b"",
+                      headers: Optional[dict[str, str]] = None,
+                      timeout: Optional[float] = None) -> HttpResponse:
+        """
+        Sends a raw request to a Bot API method on a pooled connection.
+        An idle connection the server has closed is replaced before the request is written. A request failing once
+        written is not repeated, as it may have taken effect.
+
+        :param http_method: HTTP method
+        :param method: Bot API method name
+        :param body: Request body, or a sized iterable of chunks that can be iterated over again
+        :param headers: Additional request headers
+        :param timeout: Time limit of the request in seconds, defaults to the client timeout
+        :return: HTTP response
+        """
+        return await self._request(http_method, self.path + method, body, headers, timeout)
+
+    async def download(self, file_path: str, write: Callable[[bytes], Any], timeout: Optional[float] = None) -> int:
+        """
+        Downloads a file on a pooled connection, passing its content to a function in chunks.
+
+        :param file_path: Path of the file returned by getFile
+        :param write: Function called with every chunk of the file, e.g. the write method of an open file,
+                      awaited if it is a coroutine function
+        :param timeout: Time limit of the download in seconds, defaults to the client timeout
+        :return: Size of the file in bytes
+        """
+        size = 0
+        awaited = asyncio.iscoroutinefunction(write)
+
+        async def counted(chunk: bytes):
+            nonlocal size
+            size += len(chunk)
+            if awaited:
+                await write(chunk)
+            else:
+                write(chunk)
+
+        response = await self._request("GET", self.file_path + quote(file_path), b"", None, timeout, counted)
+        if response.status != 200:
+            try:
+                description = json.loads(response.body)["description"]
+            except (ValueError, KeyError, TypeError):
+                description = response.body.decode("utf-8", "replace")
+            raise BotApiError("download", response.status, description)
+        return size
+
+    async def _request(self,
+                       http_method: str,
+                       target: str,
+                       body: Union[bytes, Iterable[bytes]],
+                       headers: Optional[dict[str, str]],
+                       timeout: Optional[float],
+                       write: Optional[Callable[[bytes], Any]] = None) -> HttpResponse:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else HttpConnection(self.host, self.port, self.ssl_context)
+            try:
+                # A connection closed by the server while idle is opened again before anything is written
+                response = await connection.request(http_method, target, body, headers, timeout or self.timeout, write)
+            finally:
+                if connection.is_open:
+                    self._idle.append(connection)
+        return response
+
+    @staticmethod
+    def result(method: str, body: bytes) -> Any:
+        """
+        Extracts the result from a Bot API response body.
+
+        :param method: Name of the called method
+        :param body: Response body
+        :return: The decoded "result" field
+        """
+        try:
+            response = json.loads(body)
+        except ValueError:
+            raise HttpError(f"{method}: response is not JSON") from None
+        if not response.get("ok"):
+            raise BotApiError(method,
+                              response.get("error_code", 0),
+                              response.get("description", ""),
+                              response.get("parameters"))
+        return response.get("result")
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        while self._idle:
+            self._idle.pop().close()
@@ -0,0 +1,216 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional, Union
+
+from .chat import Chat
+from .message import Message
+from .message_id import MessageId
+from .decoder import decode
+from .bot_api import BotApiError
+from .sender import Sender
+
+logger = logging.getLogger(__name__)
+
+def failure_category(error: BotApiError) -> str:
+    """
+    Classifies an error answered to a message sent to a chat.
+
+    :param error: Error
+    :return: "migrated", "blocked", "deactivated", "chat_not_found", "kicked", "forbidden", "bad_request" or "error"
+    """
+    description = error.description.lower()
+    if error.migrate_to_chat_id is not None:
+        return "migrated"
+    if error.error_code == 403:
+        if "blocked" in description:
+            return "blocked"
+        if "deactivated" in description:
+            return "deactivated"
+        if "kicked" in description:
+            return "kicked"
+        return "forbidden"
+    if error.error_code == 400:
+        if "chat not found" in description:
+            return "chat_not_found"
+        return "bad_request"
+    return "error"
+
+class BroadcastStats:
+    """
+    Progress of a broadcast.
+    """
+
+    __slots__ = ("position",
+                 "sent",
+                 "failed",
+                 "migrated",
+                 "started",
+                 "rate")
+
+    def __init__(self, position: int = 0):
+        """
+        :param position: Number of chats processed before the broadcast was resumed
+        """
+        self.position = position
+        self.sent = 0
+        self.failed: Counter[str] = Counter()
+        self.migrated = 0
+        self.started = time.monotonic()
+        self.rate = 0.0
+
+class Broadcast:
+    """
+    Sends the same message to a stream of chats through a Sender.
+
+    Chat identifiers are consumed lazily, at most max_in_flight messages are pending at a time.
+    Progress is saved to a checkpoint file, so a broadcast restarted with the same chats and checkpoint skips the chats
+    already processed. Chats migrated to a supergroup are sent the message at their new identifier, by the broadcast
+    or by a Sender with a MigrationTracker, and counted once, as sent or failed, and in migrated. A request failing
+    without an answer (connection error or timeout) is not repeated, as the message may have been sent, and counted
+    as failed with the "error" category, like any other unexpected error. Errors raised by on_sent and on_failed are
+    logged.
+    """
+
+    def __init__(self,
+                 sender: Sender,
+                 chats: Iterable[Union[int, str, Chat]],
+                 method: str,
+                 parameters: dict[str, Any],
+                 checkpoint: Optional[str] = None,
+                 max_in_flight: int = 1000,
+                 checkpoint_interval: float = 1,
+                 on_progress: Optional[Callable[[BroadcastStats], Any]] = None,
+                 on_sent: Optional[Callable[[Union[int, str], Union[Message, MessageId]], Any]] = None,
+                 on_failed: Optional[Callable[[Union[int, str], str, Exception], Any]] = None):
+        """
+        :param sender: Sender scheduling the requests
+        :param chats: Chat identifiers or chats to send to, in the same order when resuming
+        :param method: Method sending the message, e.g. "sendMessage" or "copyMessage"
+        :param parameters: Method parameters except chat_id
+        :param checkpoint: Path of the checkpoint file, None to disable checkpoints
+        :param max_in_flight: Maximum number of messages pending at a time
+        :param checkpoint_interval: Interval of checkpoint writes and progress reports in seconds
+        :param on_progress: Function called with the progress every checkpoint_interval seconds
+        :param on_sent: Function called with the chat identifier and the sent Message, or MessageId for copyMessage
+        :param on_failed: Function called with the chat identifier, failure category and error of every failed chat
+        """
+        self.sender = sender
+        self.chats = chats
+        self.method = method
+        self.parameters = parameters
+        self.checkpoint = checkpoint
+        self.max_in_flight = max_in_flight
+        self.checkpoint_interval = checkpoint_interval
+        self.on_progress = on_progress
+        self.on_sent = on_sent
+        self.on_failed = on_failed
+        self.stats = BroadcastStats()
+        self._result_type = MessageId if method == "copyMessage" else Message
+        self._done: set[int] = set()
+
+    def _load(self) -> tuple[int, set[int]]:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return 0, set()
+        with open(self.checkpoint, encoding="utf-8") as file:
+            state = json.load(file)
+        return state["position"], set(state["done"])
+
+    def _save(self):
+        if self.checkpoint is None:
+            return
+        temporary = self.checkpoint + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"position": self.stats.position, "done": sorted(self._done)}, file)
+        os.replace(temporary, self.checkpoint)
+
+    def _report(self, now: float, last: tuple[float, int]) -> tuple[float, int]:
+        processed = self.stats.sent + sum(self.stats.failed.values())
+        self.stats.rate = (processed - last[1]) / max(now - last[0], 1e-9)
+        self._save()
+        if self.on_progress is not None:
+            self.on_progress(self.stats)
+        return now, processed
+
+    async def _send(self, index: int, chat_id: Union[int, str], slots: asyncio.Semaphore):
+        try:
+            parameters = dict(self.parameters, chat_id=chat_id)
+            migrated = False
+            while True:
+                category = error = None
+                try:
+                    result = decode(self._result_type, await self.sender.call(self.method, parameters))
+                except BotApiError as exception:
+                    category, error = failure_category(exception), exception
+                    if category == "migrated" and not migrated:
+                        migrated = True
+                        parameters["chat_id"] = chat_id = exception.migrate_to_chat_id
+                        continue
+                except Exception as exception:
+                    # Connection errors and timeouts, which may have sent the message, or any other error
+                    category, error = "error", exception
+                break
+            if not migrated and self.sender.migrations is not None:
+                # Sent to the supergroup by the sender, if it knew or learned of the migration
+                new_id = self.sender.migrations.get(chat_id)
+                if new_id is not None:
+                    migrated = True
+                    chat_id = new_id
+            if migrated:
+                self.stats.migrated += 1
+            if error is None:
+                self.stats.sent += 1
+            else:
+                self.stats.failed[category] += 1
+            try:
+                if error is None:
+                    if self.on_sent is not None:
+                        self.on_sent(chat_id, result)
+                elif self.on_failed is not None:
+                    self.on_failed(chat_id, category, error)
+            except Exception:
+                logger.exception("Broadcast callback failed for chat %s", chat_id)
+        finally:
+            self._done.add(index)
+            while self.stats.position in self._done:
+                self._done.discard(self.stats.position)
+                self.stats.position += 1
+            slots.release()
+
+    async def run(self) -> BroadcastStats:
+        """
+        Sends the message to all chats, resuming from the checkpoint if it exists.
+
+        :return: Final progress
+        """
+        position, done = self._load()
+        self.stats = BroadcastStats(position)
+        self._done = set(done)
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks: set[asyncio.Task] = set()
+        last = (time.monotonic(), 0)
+        for index, chat in enumerate(itertools.islice(self.chats, position, None), position):
+            if index in done:
+                continue
+            await slots.acquire()
+            task = asyncio.ensure_future(self._send(index, chat.id if isinstance(chat, Chat) else chat, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            now = time.monotonic()
+            if now - last[0] >= self.checkpoint_interval:
+                last = self._report(now, last)
+        while tasks:
+            await asyncio.wait(set(tasks), timeout=self.checkpoint_interval)
+            last = self._report(time.monotonic(), last)
+        self._report(time.monotonic(), last)
+        return self.stats
@@ -2,17 +2,52 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from typing import Optional
+from __future__ import annotations
 
-from message import Message
+from typing import TYPE_CHECKING, Optional, Union
 
-class Chat:
+from .telegram_object import TelegramObject
+
+if TYPE_CHECKING:
+    from .message import Message  # The message module imports this module
+    from .bot_api import BotApi
+
+class Chat(TelegramObject):
     """
     This object represents a chat.
 
     https://core.telegram.org/bots/api#chat
     """
 
+    __slots__ = ("id",
+                 "type",
+                 "title",
+                 "username",
+                 "first_name",
+                 "last_name",
+                 "is_forum",
+                 "photo",
+                 "active_usernames",
+                 "emoji_status_custom_emoji_id",
+                 "bio",
+                 "has_private_forwards",
+                 "has_restricted_voice_and_video_messages",
+                 "join_to_send_messages",
+                 "join_by_request",
+                 "description",
+                 "invite_link",
+                 "pinned_message",
+                 "permissions",
+                 "slow_mode_delay",
+                 "message_auto_delete_time",
+                 "has_aggressive_anti_spam_enabled",
+                 "has_hidden_members",
+                 "has_protected_content",
+                 "sticker_set_name",
+                 "can_set_sticker_set",
+                 "linked_chat_id",
+                 "location")
+
     def __init__(self,
                  id_: int,
                  type_: str,
@@ -100,3 +135,18 @@ class Chat:
         self.can_set_sticker_set = can_set_sticker_set
         self.linked_chat_id = linked_chat_id
         self.location = location
+
+    @staticmethod
+    async def get_chat(api: BotApi, chat_id: Union[int, str]) -> Chat:
+        """
+        Use this method to get up to date information about the chat (current name of the user for one-on-one conversations, current username of a user, group or channel, etc.).
+
+        :param api: Bot API client
+        :param chat_id: Unique identifier for the target chat or username of the target supergroup or channel (in the format @channelusername)
+        :return: Returns a Chat object on success.
+
+        https://core.telegram.org/bots/api#getchat
+        """
+        from .decoder import decode  # The decoder imports this module
+
+        return decode(Chat, await api.call("getChat", {"chat_id": chat_id}))
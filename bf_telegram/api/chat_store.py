@@ -0,0 +1,189 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+from .chat import Chat
+from .message import Message
+from .update import Update
+from .migrations import MigrationTracker
+
+_BASIC = ("type", "title", "username", "first_name", "last_name", "is_forum")
+
+class _Entry:
+    __slots__ = ("chat",
+                 "expires")
+
+    def __init__(self, chat: Chat, expires: float):
+        self.chat = chat
+        self.expires = expires
+
+class ChatStore:
+    """
+    Keeps the full information about chats returned by getChat, updated from the messages received in them.
+
+    getChat is called only for a chat not in the store or whose information is older than ttl seconds, and simultaneous
+    requests for the same chat share one call. Service messages are applied to the stored chat: new_chat_title,
+    delete_chat_photo, pinned_message and message_auto_delete_timer_changed update it, new_chat_photo (whose sizes
+    differ from the ChatPhoto returned by getChat) makes it expire, and migrate_to_chat_id removes it, as the chat is
+    replaced by a supergroup. The basic fields (title, username, names, type, is_forum) of every message chat are
+    copied to the stored chat. Chats are LRU-evicted beyond max_size entries. With a MigrationTracker, migrations are
+    recorded in it and a migrated group is looked up as its supergroup. A chat can also be looked up by its username,
+    which is kept mapped to its id as chats are stored, renamed and removed.
+    """
+
+    def __init__(self,
+                 api: Any,
+                 ttl: float = 3600,
+                 max_size: int = 100000,
+                 migrations: Optional[MigrationTracker] = None):
+        """
+        :param api: Bot API client, or an object calling Bot API methods like a Sender
+        :param ttl: Time after which the information about a chat is requested again in seconds
+        :param max_size: Maximum number of chats kept
+        :param migrations: Migrations of groups to supergroups
+        """
+        self.api = api
+        self.ttl = ttl
+        self.max_size = max_size
+        self.migrations = migrations
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._chats: OrderedDict[int, _Entry] = OrderedDict()
+        self._usernames: dict[str, int] = {}
+        self._requests: dict[Union[int, str], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._chats)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._chats
+
+    async def get(self, chat_id: Union[int, str]) -> Chat:
+        """
+        Returns the full information about a chat, calling getChat if it is missing or expired.
+
+        :param chat_id: Unique identifier of the chat or username of the chat (in the format @username)
+        :return: Stored chat, updated in place by later messages
+        """
+        if isinstance(chat_id, str):
+            # Usernames are case-insensitive, a username not stored yet is requested as given
+            chat_id = self._usernames.get(chat_id.removeprefix("@").lower(), chat_id)
+        if self.migrations is not None and isinstance(chat_id, int):
+            chat_id = self.migrations.resolve(chat_id)
+        entry = self._chats.get(chat_id)
+        if entry is not None and entry.expires > time.monotonic():
+            self.hits += 1
+            self._chats.move_to_end(chat_id)
+            return entry.chat
+        request = self._requests.get(chat_id)
+        if request is None:
+            self.misses += 1
+            request = self._requests[chat_id] = asyncio.ensure_future(self._request(chat_id))
+            request.add_done_callback(lambda _: self._requests.pop(chat_id, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(request)
+
+    async def _request(self, chat_id: Union[int, str]) -> Chat:
+        chat = await Chat.get_chat(self.api, chat_id)
+        self.put(chat)
+        return chat
+
+    def put(self, chat: Chat):
+        """
+        Stores the full information about a chat, e.g. the result of a getChat call made elsewhere.
+
+        :param chat: Chat as returned by getChat
+        """
+        entry = self._chats.get(chat.id)
+        if entry is not None:
+            self._unindex(entry.chat)
+        self._chats[chat.id] = _Entry(chat, time.monotonic() + self.ttl)
+        self._chats.move_to_end(chat.id)
+        self._index(chat)
+        if len(self._chats) > self.max_size:
+            self._unindex(self._chats.popitem(last=False)[1].chat)
+
+    def _index(self, chat: Chat):
+        if chat.username is not None:
+            self._usernames[chat.username.lower()] = chat.id
+
+    def _unindex(self, chat: Chat):
+        if chat.username is not None and self._usernames.get(chat.username.lower()) == chat.id:
+            del self._usernames[chat.username.lower()]
+
+    def invalidate(self, chat_id: int):
+        """
+        Makes the information about a chat expire, so it is requested again on next use.
+
+        :param chat_id: Unique identifier of the chat
+        """
+        entry = self._chats.get(chat_id)
+        if entry is not None:
+            entry.expires = 0
+
+    def remove(self, chat_id: int):
+        """
+        Removes a chat from the store.
+
+        :param chat_id: Unique identifier of the chat
+        """
+        entry = self._chats.pop(chat_id, None)
+        if entry is not None:
+            self._unindex(entry.chat)
+
+    def apply(self, message: Message) -> Optional[Chat]:
+        """
+        Applies the chat and service fields of a received message to the stored chat.
+
+        :param message: Received message
+        :return: Stored chat, None if the chat is not stored
+        """
+        if message.chat is None:
+            return None
+        if self.migrations is not None:
+            self.migrations.apply(message)
+        entry = self._chats.get(message.chat.id)
+        if entry is None:
+            return None
+        chat = entry.chat
+        self._unindex(chat)
+        for name in _BASIC:
+            value = getattr(message.chat, name)
+            if value is not None:
+                setattr(chat, name, value)
+        self._index(chat)
+        if message.new_chat_title is not None:
+            chat.title = message.new_chat_title
+        if message.delete_chat_photo:
+            chat.photo = None
+        if message.new_chat_photo is not None:
+            entry.expires = 0
+        if message.pinned_message is not None:
+            chat.pinned_message = message.pinned_message
+        timer = message.message_auto_delete_timer_changed
+        if timer is not None:
+            time_ = timer["message_auto_delete_time"] if isinstance(timer, dict) else timer.message_auto_delete_time
+            chat.message_auto_delete_time = time_ or None
+        if message.migrate_to_chat_id is not None:
+            self.remove(chat.id)
+        return chat
+
+    def apply_update(self, update: Update) -> Optional[Chat]:
+        """
+        Applies the message or channel post of an update to the stored chat. Edited messages carry no service fields
+        and are not applied.
+
+        :param update: Received update
+        :return: Stored chat, None if the update has no message or its chat is not stored
+        """
+        message = update.message or update.channel_post
+        return self.apply(message) if message is not None else None
@@ -0,0 +1,117 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Collection, Iterable, Optional
+
+UPDATE_TYPES = ("message", "edited_message", "channel_post", "edited_channel_post")
+"""
+Update fields holding a message, in the order of their update_type codes.
+"""
+
+CHAT_TYPES = ("private", "group", "supergroup", "channel")
+"""
+Chat types, in the order of their chat_type codes.
+"""
+
+COLUMNS = {
+    "update_id": ("q", "u['update_id']"),
+    "update_type": ("b", "k"),
+    "message_id": ("q", "m['message_id']"),
+    "date": ("q", "m['date']"),
+    "chat_id": ("q", "m['chat']['id']"),
+    "chat_type": ("b", "chat_types.get(m['chat']['type'], -1)"),
+    "from_id": ("q", "f['id'] if (f := m.get('from')) is not None else 0"),
+    "text_length": ("q", "len(t) if (t := m.get('text') or m.get('caption')) is not None else 0"),
+}
+"""
+Columns of UpdateColumns, mapped to their array type code and the expression computing them from an update u,
+its message m and its update type code k.
+"""
+
+_extenders: dict[tuple[str, ...], Callable[..., None]] = {}
+
+def _compile(columns: tuple[str, ...]) -> Callable[..., None]:
+    lines = [f"def extend(result, {', '.join('a_' + column for column in columns)}):",
+             "    for u in result:",
+             "        for k, key in enumerate(update_types):",
+             "            if (m := u.get(key)) is not None:",
+             "                break",
+             "        else:",
+             "            k = -1"]
+    if "update_id" in columns:
+        lines.append(f"        a_update_id({COLUMNS['update_id'][1]})")
+    lines.append("        if m is None:")
+    lines += [f"            a_{column}({-1 if column in ('update_type', 'chat_type') else 0})"
+              for column in columns if column != "update_id"] or ["            pass"]
+    lines.append("        else:")
+    lines += [f"            a_{column}({COLUMNS[column][1]})" for column in columns if column != "update_id"] \
+        or ["            pass"]
+    namespace = {"update_types": UPDATE_TYPES, "chat_types": {type_: code for code, type_ in enumerate(CHAT_TYPES)}}
+    exec(compile("\n".join(lines), f"<columns {', '.join(columns)}>", "exec"), namespace)
+    extend = _extenders[columns] = namespace["extend"]
+    return extend
+
+class UpdateColumns:
+    """
+    Scalar fields of a batch of updates stored column by column in typed arrays, without building API objects.
+
+    Columns are update_id, update_type (index in UPDATE_TYPES), and the message_id, date, chat_id, chat_type
+    (index in CHAT_TYPES), from_id and text_length (length of the text or caption in code points) of the message
+    of the update. Updates without a message have 0 in the message columns and -1 in update_type and chat_type.
+    """
+
+    def __init__(self, columns: Optional[Collection[str]] = None):
+        """
+        :param columns: Names of the columns to keep, None for all
+        """
+        self.columns = tuple(COLUMNS) if columns is None else tuple(column for column in COLUMNS if column in columns)
+        unknown = set(columns or ()) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns {', '.join(sorted(unknown))}")
+        self.arrays = {column: array(COLUMNS[column][0]) for column in self.columns}
+        self._extend = _extenders.get(self.columns) or _compile(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.arrays[self.columns[0]]) if self.columns else 0
+
+    def __getattr__(self, name: str) -> array:
+        try:
+            return self.__dict__["arrays"][name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+
+    def extend(self, result: Iterable[dict]):
+        """
+        Appends the result of a getUpdates call or a batch of webhook bodies.
+
+        :param result: Decoded JSON array of updates
+        """
+        self._extend(result, *(self.arrays[column].append for column in self.columns))
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Converts the columns to NumPy arrays sharing memory with the typed arrays, which must not be extended meanwhile.
+        Requires NumPy.
+
+        :return: NumPy arrays by column name
+        """
+        import numpy  # Optional dependency
+
+        return {column: numpy.frombuffer(values, dtype=values.typecode) if len(values) else
+                numpy.array([], dtype=values.typecode) for column, values in self.arrays.items()}
+
+def decode_columns(result: Iterable[dict], columns: Optional[Collection[str]] = None) -> UpdateColumns:
+    """
+    Decodes the result of a getUpdates call or a batch of webhook bodies into columns.
+
+    :param result: Decoded JSON array of updates
+    :param columns: Names of the columns to keep, None for all
+    :return: Columns
+    """
+    update_columns = UpdateColumns(columns)
+    update_columns.extend(result)
+    return update_columns
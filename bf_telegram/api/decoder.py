@@ -0,0 +1,235 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable, Iterable, get_args, get_origin
+
+from .user import User
+from .chat import Chat
+from .message_entity import MessageEntity
+from .message_id import MessageId
+from .photo_size import PhotoSize
+from .animation import Animation
+from .audio import Audio
+from .document import Document
+from .video import Video
+from .video_note import VideoNote
+from .message import Message
+from .webhook_info import WebhookInfo
+from .file import File
+from .update import Update
+
+NESTED: dict[type, dict[str, Any]] = {
+    User: {},
+    Chat: {
+        "pinned_message": Message,
+    },
+    MessageEntity: {
+        "user": User,
+    },
+    MessageId: {},
+    PhotoSize: {},
+    Animation: {
+        "thumb": PhotoSize,
+    },
+    Audio: {
+        "thumb": PhotoSize,
+    },
+    Document: {
+        "thumb": PhotoSize,
+    },
+    Video: {
+        "thumb": PhotoSize,
+    },
+    VideoNote: {
+        "thumb": PhotoSize,
+    },
+    Message: {
+        "from": User,
+        "sender_chat": Chat,
+        "chat": Chat,
+        "forward_from": User,
+        "forward_from_chat": Chat,
+        "reply_to_message": Message,
+        "via_bot": User,
+        "entities": list[MessageEntity],
+        "animation": Animation,
+        "audio": Audio,
+        "document": Document,
+        "photo": list[PhotoSize],
+        "video": Video,
+        "video_note": VideoNote,
+        "caption_entities": list[MessageEntity],
+        "new_chat_members": list[User],
+        "left_chat_member": User,
+        "new_chat_photo": list[PhotoSize],
+        "pinned_message": Message,
+    },
+    WebhookInfo: {},
+    File: {},
+    Update: {
+        "message": Message,
+        "edited_message": Message,
+        "channel_post": Message,
+        "edited_channel_post": Message,
+    },
+}
+"""
+Nested object fields of every known API type, keyed by wire name.
+Fields of types not implemented yet are left as plain dicts by the decoder.
+"""
+
+_namespace: dict[str, Any] = {}
+_decoders: dict[type, Callable[[dict], Any]] = {}
+_clearers: dict[type, Callable[[Any], None]] = {}
+
+def wire_name(name: str) -> str:
+    """
+    Converts a Python parameter or attribute name to its Bot API name (``from_`` -> ``from``, ``id_`` -> ``id``).
+
+    :param name: Python name
+    :return: Bot API field name
+    """
+    return name[:-1] if name.endswith("_") else name
+
+def parameters(cls: type) -> list[inspect.Parameter]:
+    """
+    Returns the constructor parameters of an API type, in declaration order.
+
+    :param cls: API type
+    :return: Constructor parameters without self
+    """
+    return list(inspect.signature(cls.__init__).parameters.values())[1:]
+
+def attributes(cls: type) -> tuple[str, ...]:
+    """
+    Returns the attributes of an API type, in declaration order.
+
+    :param cls: API type
+    :return: Attribute names
+    """
+    return cls.__slots__
+
+def blank(cls: type) -> Any:
+    """
+    Creates an instance of an API type with all fields set to None, without calling its constructor.
+
+    :param cls: API type
+    :return: Instance of cls
+    """
+    instance = object.__new__(cls)
+    try:
+        _clearers[cls](instance)
+    except KeyError:
+        namespace = {}
+        exec(compile(f"def clear(o): o.{' = o.'.join(attributes(cls))} = None", f"<decoder {cls.__name__}>", "exec"),
+             namespace)
+        _clearers[cls] = namespace["clear"]
+        _clearers[cls](instance)
+    return instance
+
+def _decoder_name(cls: type) -> str:
+    return "decode_" + cls.__name__
+
+def _setters(cls: type, namespace: dict[str, Any]) -> dict[str, Callable[[Any, Any], None]]:
+    nested = NESTED.get(cls, {})
+    setters = {}
+    for attribute in attributes(cls):
+        key = wire_name(attribute)
+        type_ = nested.get(key)
+        if type_ is None:
+            setters[key] = getattr(cls, attribute).__set__
+            continue
+        if get_origin(type_) is list:
+            value = f"[{_decoder_name(get_args(type_)[0])}(i) for i in v]"
+        else:
+            value = f"{_decoder_name(type_)}(v)"
+        name = f"set_{cls.__name__}_{attribute}"
+        exec(compile(f"def {name}(o, v): o.{attribute} = {value}", f"<decoder {cls.__name__}>", "exec"), namespace)
+        setters[key] = namespace.pop(name)
+    return setters
+
+def _decoder(cls: type, setters: dict[str, Callable[[Any, Any], None]]) -> Callable[[dict], Any]:
+    new = object.__new__
+    blank(cls)
+    clear = _clearers[cls]
+    setter = setters.get
+
+    def decode(data: dict) -> Any:
+        instance = new(cls)
+        clear(instance)
+        for key, value in data.items():
+            if value is not None and (set_ := setter(key)) is not None:
+                set_(instance, value)
+        return instance
+
+    decode.__name__ = decode.__qualname__ = _decoder_name(cls)
+    return decode
+
+def _compile(cls: type) -> Callable[[dict], Any]:
+    decoder = _decoders[cls] = _namespace[_decoder_name(cls)] = _decoder(cls, _setters(cls, _namespace))
+    for type_ in NESTED.get(cls, {}).values():
+        if get_origin(type_) is list:
+            type_ = get_args(type_)[0]
+        if type_ not in _decoders:
+            _compile(type_)
+    return decoder
+
+def decoder(cls: type) -> Callable[[dict], Any]:
+    """
+    Returns the decoder of an API type, compiling it (and the decoders of its nested types) on first use.
+    Fields missing from the data are set to None, fields unknown to the type are ignored.
+
+    :param cls: API type
+    :return: Function building an instance of cls from a decoded JSON object
+    """
+    try:
+        return _decoders[cls]
+    except KeyError:
+        return _compile(cls)
+
+def derived_decoder(cls: type, factories: dict[type, Callable[[dict], Any]]) -> Callable[[dict], Any]:
+    """
+    Compiles a separate decoder of an API type whose nested fields of the given types are built by other factories.
+    Decoders of other nested types are shared with the regular decoder.
+
+    :param cls: API type
+    :param factories: Nested types mapped to functions building them from decoded JSON objects
+    :return: Function building an instance of cls from a decoded JSON object
+    """
+    decoder(cls)
+    namespace = dict(_namespace)
+    namespace.update({_decoder_name(type_): factory for type_, factory in factories.items()})
+    return _decoder(cls, _setters(cls, namespace))
+
+def decode(cls: type, data: dict) -> Any:
+    """
+    Builds an API object from a decoded JSON object.
+
+    :param cls: API type
+    :param data: Decoded JSON object as received from the Bot API
+    :return: Instance of cls
+    """
+    return decoder(cls)(data)
+
+def decode_list(cls: type, data: Iterable[dict]) -> list:
+    """
+    Builds a list of API objects from decoded JSON objects.
+
+    :param cls: API type
+    :param data: Decoded JSON objects as received from the Bot API
+    :return: List of cls instances
+    """
+    return list(map(decoder(cls), data))
+
+def decode_updates(result: Iterable[dict]) -> list[Update]:
+    """
+    Decodes the result of a getUpdates call or a batch of webhook bodies in a single pass.
+
+    :param result: Decoded JSON array of updates
+    :return: List of updates
+    """
+    return list(map(decoder(Update), result))
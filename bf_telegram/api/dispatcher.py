@@ -0,0 +1,174 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Optional
+
+from .update import Update
+
+if TYPE_CHECKING:
+    from .migrations import MigrationTracker
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_FIELDS = ("message", "edited_message", "channel_post", "edited_channel_post")
+_CHAT_FIELDS = ("my_chat_member", "chat_member", "chat_join_request")
+_USER_FIELDS = ("inline_query", "chosen_inline_result", "shipping_query", "pre_checkout_query")
+
+def _field(value: Any, name: str) -> Any:
+    return value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+def chat_key(update: Update) -> Optional[int]:
+    """
+    Returns the identifier of the chat an update belongs to, or of the user for updates outside of chats.
+    Private chats share their identifier with the user, so both kinds of updates of one user get the same key.
+
+    :param update: Update
+    :return: Chat or user identifier, None for updates not bound to any (polls, poll answers of anonymous polls)
+    """
+    for name in _MESSAGE_FIELDS:
+        message = getattr(update, name)
+        if message is not None:
+            return message.chat.id
+    callback_query = update.callback_query
+    if callback_query is not None:
+        message = _field(callback_query, "message")
+        if message is not None:
+            return _field(_field(message, "chat"), "id")
+        return _field(_field(callback_query, "from"), "id")
+    for name in _CHAT_FIELDS:
+        value = getattr(update, name)
+        if value is not None:
+            return _field(_field(value, "chat"), "id")
+    for name in _USER_FIELDS:
+        value = getattr(update, name)
+        if value is not None:
+            return _field(_field(value, "from"), "id")
+    poll_answer = update.poll_answer
+    if poll_answer is not None:
+        return _field(_field(poll_answer, "user"), "id")
+    return None
+
+class Dispatcher:
+    """
+    Handles updates concurrently across chats while keeping the order of updates within every chat.
+
+    Every chat with pending updates has its own queue. Workers take the next chat that is not being handled,
+    handle one of its updates and put the chat back at the end of the line, so a slow or busy chat holds at most
+    one worker and never delays other chats. put() waits while a chat or the dispatcher as a whole has too many
+    pending updates.
+
+    With a MigrationTracker, which learns migrations from the updates put, updates of a group that migrated
+    to a supergroup share the queue of the supergroup, so both are handled in order. Updates queued under the group
+    before its migration was learned are not reordered.
+    """
+
+    def __init__(self,
+                 handler: Callable[[Update], Awaitable[Any]],
+                 workers: int = 16,
+                 max_chat_pending: int = 100,
+                 max_pending: int = 10000,
+                 key: Callable[[Update], Optional[Hashable]] = chat_key,
+                 executor: Optional[Executor] = None,
+                 migrations: Optional[MigrationTracker] = None):
+        """
+        :param handler: Coroutine function called with every update
+        :param workers: Number of worker tasks, i.e. of chats handled at the same time
+        :param max_chat_pending: Maximum number of pending updates of one chat
+        :param max_pending: Maximum number of pending updates of all chats
+        :param key: Function returning the ordering key of an update, updates with None are not ordered
+        :param executor: Executor for run_in_executor(), e.g. a ProcessPoolExecutor for CPU-heavy handlers
+        :param migrations: Migrations of groups to supergroups, None to order updates by the chats they were sent in
+        """
+        self.handler = handler
+        self.workers = workers
+        self.max_chat_pending = max_chat_pending
+        self.max_pending = max_pending
+        self.key = key
+        self.executor = executor
+        self.migrations = migrations
+        self.pending = 0
+        self._chats: dict[Hashable, deque[Update]] = {}
+        self._ready: asyncio.Queue[Hashable] = asyncio.Queue()
+        self._space = asyncio.Condition()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        """
+        Starts the worker tasks.
+        """
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """
+        Waits for all pending updates to be handled and stops the worker tasks.
+        """
+        await self.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def join(self):
+        """
+        Waits for all pending updates to be handled.
+        """
+        async with self._space:
+            await self._space.wait_for(lambda: self.pending == 0)
+
+    async def put(self, update: Update):
+        """
+        Queues an update, waiting while its chat or the dispatcher has too many pending updates.
+
+        :param update: Update
+        """
+        key = self.key(update)
+        if key is None:
+            key = ("update", update.update_id)
+        elif self.migrations is not None:
+            self.migrations.apply_update(update)
+            key = self.migrations.resolve(key)
+        queue = self._chats.get(key)
+        if self.pending >= self.max_pending or (queue is not None and len(queue) >= self.max_chat_pending):
+            async with self._space:
+                await self._space.wait_for(lambda: self.pending < self.max_pending
+                                           and len(self._chats.get(key, ())) < self.max_chat_pending)
+            queue = self._chats.get(key)
+        self.pending += 1
+        if queue is None:
+            self._chats[key] = deque((update,))
+            self._ready.put_nowait(key)
+        else:
+            queue.append(update)
+
+    async def run_in_executor(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs a function in the executor of the dispatcher, e.g. CPU-heavy work of a handler in another process.
+
+        :param function: Function, must be picklable for a process pool
+        :param args: Arguments
+        :return: Result of the function
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def _work(self):
+        while True:
+            key = await self._ready.get()
+            queue = self._chats[key]
+            update = queue.popleft()
+            try:
+                await self.handler(update)
+            except Exception:
+                logger.exception("Update %s handler failed", update.update_id)
+            if queue:
+                self._ready.put_nowait(key)
+            else:
+                del self._chats[key]
+            self.pending -= 1
+            async with self._space:
+                self._space.notify_all()
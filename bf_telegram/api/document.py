@@ -2,17 +2,27 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-from photo_size import PhotoSize
+from .telegram_object import TelegramObject
+from .photo_size import PhotoSize
 
-class Document:
+class Document(TelegramObject):
     """
     This object represents a general file (as opposed to photos, voice messages and audio files).
 
     https://core.telegram.org/bots/api#document
     """
 
+    __slots__ = ("file_id",
+                 "file_unique_id",
+                 "thumb",
+                 "file_name",
+                 "mime_type",
+                 "file_size")
+
     def __init__(self,
                  file_id: str,
                  file_unique_id: str,
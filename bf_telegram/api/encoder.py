@@ -0,0 +1,118 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from json.encoder import encode_basestring
+from math import isfinite
+from typing import Any, Callable
+
+from .telegram_object import TelegramObject
+
+_encoders: dict[type, Callable[[Any, Callable[[str], None]], None]] = {}
+
+def fields(cls: type) -> list[str]:
+    """
+    Returns the public fields of an API type or of a subclass of one, in declaration order.
+
+    :param cls: API type
+    :return: Attribute names
+    """
+    return [name for base in reversed(cls.__mro__) for name in base.__dict__.get("__slots__", ())
+            if not name.startswith("_")]
+
+def _value(value: Any, write: Callable[[str], None]):
+    type_ = type(value)
+    if type_ is str:
+        write(encode_basestring(value))
+    elif type_ is int:
+        write(int.__repr__(value))
+    elif value is None:
+        write("null")
+    elif type_ is bool:
+        write("true" if value else "false")
+    elif type_ is float:
+        if not isfinite(value):
+            raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+        write(float.__repr__(value))
+    elif type_ is list or type_ is tuple:
+        separator = "["
+        for item in value:
+            write(separator)
+            separator = ","
+            _value(item, write)
+        write("]" if separator == "," else "[]")
+    elif type_ is dict:
+        separator = "{"
+        for key, item in value.items():
+            if item is not None:
+                write(separator)
+                separator = ","
+                write(encode_basestring(key if type(key) is str else _key(key)))
+                write(":")
+                _value(item, write)
+        write("}" if separator == "," else "{}")
+    elif isinstance(value, TelegramObject):
+        encoder(type_)(value, write)
+    else:
+        raise TypeError(f"Object of type {type_.__name__} is not JSON serializable")
+
+def _key(key: Any) -> str:
+    # Converted like json.dumps does
+    if isinstance(key, str):
+        return key
+    if key is None:
+        return "null"
+    if isinstance(key, bool):
+        return "true" if key else "false"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        if not isfinite(key):
+            raise ValueError(f"Out of range float values are not JSON compliant: {key!r}")
+        return float.__repr__(key)
+    raise TypeError(f"Keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+def _compile(cls: type) -> Callable[[Any, Callable[[str], None]], None]:
+    lines = ["def encode(o, a):",
+             "    s = '{'"]
+    for attribute in fields(cls):
+        key = attribute[:-1] if attribute.endswith("_") else attribute
+        lines += [f"    if (v := o.{attribute}) is not None:",
+                  f"        a(s + {encode_basestring(key) + ':'!r})",
+                  "        s = ','",
+                  "        if type(v) is str: a(es(v))",
+                  "        else: value(v, a)"]
+    lines.append("    a('}' if s == ',' else '{}')")
+    namespace = {"es": encode_basestring, "value": _value}
+    exec(compile("\n".join(lines), f"<encoder {cls.__name__}>", "exec"), namespace)
+    encode = _encoders[cls] = namespace["encode"]
+    return encode
+
+def encoder(cls: type) -> Callable[[Any, Callable[[str], None]], None]:
+    """
+    Returns the encoder of an API type, compiling it on first use.
+    The encoder writes the JSON representation of an instance piece by piece, skipping None-valued fields
+    and using Bot API field names.
+
+    :param cls: API type
+    :return: Function called with an instance of cls and a function writing a piece of JSON
+    """
+    try:
+        return _encoders[cls]
+    except KeyError:
+        return _compile(cls)
+
+def encode(value: Any) -> bytes:
+    """
+    Serializes an API object, or a list or dict containing API objects, to Bot API JSON.
+    None-valued fields and dict entries are omitted. Dict keys that are not strings are converted like json.dumps
+    does, and NaN and infinite floats are rejected, as the Bot API accepts only valid JSON.
+
+    :param value: Value to serialize
+    :return: UTF-8 encoded JSON
+    """
+    parts = []
+    _value(value, parts.append)
+    return "".join(parts).encode()
@@ -0,0 +1,85 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Collection, Iterator, Optional
+
+from .message import Message
+from .message_entity import MessageEntity
+
+_ASTRAL = re.compile("[\U00010000-\U0010FFFF]")
+
+class EntityText:
+    """
+    Text of a message with an index converting offsets in UTF-16 code units, used by MessageEntity, to string indices.
+
+    Python strings are indexed by code point, and characters outside the Basic Multilingual Plane (most emoji) take two
+    UTF-16 code units. The index keeps the code unit positions of those characters only, so converting an offset is
+    O(log n) in their number, and text without them is sliced directly.
+    """
+
+    __slots__ = ("text",
+                 "_astral")
+
+    def __init__(self, text: str):
+        """
+        :param text: Text or caption of a message
+        """
+        self.text = text
+        if text.isascii() or len(text.encode("utf-16-le")) == 2 * len(text):
+            self._astral: Optional[list[int]] = None
+        else:
+            self._astral = [match.start() + index for index, match in enumerate(_ASTRAL.finditer(text))]
+
+    def index(self, offset: int) -> int:
+        """
+        Converts an offset in UTF-16 code units to a string index.
+
+        :param offset: Offset in UTF-16 code units, not pointing into the middle of a character
+        :return: String index
+        """
+        if self._astral is None:
+            return offset
+        return offset - bisect_left(self._astral, offset)
+
+    def slice(self, offset: int, length: int) -> str:
+        """
+        Returns the part of the text at an offset and length in UTF-16 code units.
+
+        :param offset: Offset in UTF-16 code units
+        :param length: Length in UTF-16 code units
+        :return: Part of the text
+        """
+        if self._astral is None:
+            return self.text[offset:offset + length]
+        return self.text[self.index(offset):self.index(offset + length)]
+
+    def __getitem__(self, entity: MessageEntity) -> str:
+        """
+        Returns the part of the text an entity applies to.
+
+        :param entity: Entity of the text
+        :return: Part of the text
+        """
+        return self.slice(entity.offset, entity.length)
+
+def entities(message: Message, types: Optional[Collection[str]] = None) -> Iterator[tuple[MessageEntity, str]]:
+    """
+    Iterates over the entities of a message text and caption together with the parts of the text they apply to.
+    Every text is indexed once.
+
+    :param message: Message
+    :param types: Entity types to return, e.g. {"bot_command", "mention", "url", "hashtag"}, None for all
+    :return: Iterator of entities and their text
+    """
+    for text, text_entities in ((message.text, message.entities), (message.caption, message.caption_entities)):
+        if not text or not text_entities:
+            continue
+        index = EntityText(text)
+        for entity in text_entities:
+            if types is None or entity.type in types:
+                yield entity, index.slice(entity.offset, entity.length)
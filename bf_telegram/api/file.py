@@ -0,0 +1,55 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from .telegram_object import TelegramObject
+
+if TYPE_CHECKING:
+    from .bot_api import BotApi
+
+class File(TelegramObject):
+    """
+    This object represents a file ready to be downloaded.
+    The file can be downloaded via the link https://api.telegram.org/file/bot<token>/<file_path>.
+    It is guaranteed that the link will be valid for at least 1 hour.
+    When the link expires, a new one can be requested by calling getFile.
+
+    https://core.telegram.org/bots/api#file
+    """
+
+    __slots__ = ("file_id",
+                 "file_unique_id",
+                 "file_size",
+                 "file_path")
+
+    def __init__(self, file_id: str, file_unique_id: str, file_size: Optional[int] = None, file_path: Optional[str] = None):
+        """
+        :param file_id: Identifier for this file, which can be used to download or reuse the file
+        :param file_unique_id: Unique identifier for this file, which is supposed to be the same over time and for different bots. Can't be used to download or reuse the file.
+        :param file_size: File size in bytes
+        :param file_path: File path. Use https://api.telegram.org/file/bot<token>/<file_path> to get the file.
+        """
+        self.file_id = file_id
+        self.file_unique_id = file_unique_id
+        self.file_size = file_size
+        self.file_path = file_path
+
+    @staticmethod
+    async def get_file(api: BotApi, file_id: str) -> File:
+        """
+        Use this method to get basic information about a file and prepare it for downloading.
+        For the moment, bots can download files of up to 20MB in size.
+
+        :param api: Bot API client
+        :param file_id: File identifier to get information about
+        :return: On success, a File object is returned. The file can then be downloaded with BotApi.download.
+
+        https://core.telegram.org/bots/api#getfile
+        """
+        from .decoder import decode  # The decoder imports this module
+
+        return decode(File, await api.call("getFile", {"file_id": file_id}))
@@ -0,0 +1,150 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from .bot_api import BotApi
+from .file import File
+
+_UNIQUE_ID = re.compile("[A-Za-z0-9_-]+")
+
+class FileCache:
+    """
+    Downloads files into a directory, keeping one copy per file_unique_id.
+
+    A file already in the cache is not downloaded again, however many messages (e.g. forwards of the same photo or
+    sticker) refer to it, and simultaneous requests for the same file share one download. Downloads are written to
+    disk chunk by chunk. The least recently used files are deleted when the cache exceeds max_size bytes.
+    Files found in the directory are reused across restarts.
+
+    Any object with file_id and file_unique_id fields can be requested, e.g. PhotoSize, Animation, Audio, Document,
+    Video, VideoNote or File.
+    """
+
+    def __init__(self,
+                 api: BotApi,
+                 directory: str,
+                 max_size: int = 1 << 30,
+                 max_downloads: int = 8,
+                 timeout: float = 300):
+        """
+        :param api: Bot API client
+        :param directory: Cache directory, created if missing
+        :param max_size: Maximum total size of cached files in bytes
+        :param max_downloads: Maximum number of simultaneous downloads
+        :param timeout: Time limit of a download in seconds
+        """
+        self.api = api
+        self.directory = directory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._downloads: dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(max_downloads)
+        os.makedirs(directory, exist_ok=True)
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and _UNIQUE_ID.fullmatch(entry.name)]
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            self._files[entry.name] = entry.stat().st_size
+            self.size += entry.stat().st_size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, file_unique_id: str) -> bool:
+        return file_unique_id in self._files
+
+    def path(self, file_unique_id: str) -> str:
+        """
+        Returns the path a file is cached at.
+
+        :param file_unique_id: Unique identifier of the file
+        :return: Path, the file may be missing
+        """
+        if not _UNIQUE_ID.fullmatch(file_unique_id):
+            raise ValueError(f"Invalid file_unique_id {file_unique_id!r}")
+        return os.path.join(self.directory, file_unique_id)
+
+    async def get(self, file) -> str:
+        """
+        Returns the path of a cached file, downloading it first if needed.
+        The file may be evicted later, so it should be opened soon after.
+
+        :param file: Object with file_id and file_unique_id fields
+        :return: Path of the cached file
+        """
+        file_unique_id = file.file_unique_id
+        if file_unique_id in self._files:
+            self.hits += 1
+            self._files.move_to_end(file_unique_id)
+            return self.path(file_unique_id)
+        download = self._downloads.get(file_unique_id)
+        if download is None:
+            self.misses += 1
+            download = asyncio.ensure_future(self._download(file.file_id, file_unique_id))
+            self._downloads[file_unique_id] = download
+            download.add_done_callback(lambda _: self._downloads.pop(file_unique_id, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(download)
+
+    async def _download(self, file_id: str, file_unique_id: str) -> str:
+        path = self.path(file_unique_id)
+        temporary = path + ".part"
+        async with self._slots:
+            file_path = (await File.get_file(self.api, file_id)).file_path
+            try:
+                with open(temporary, "wb") as output:
+                    async def write(chunk: bytes):
+                        # In a thread, so a slow disk does not stall the event loop
+                        await asyncio.to_thread(output.write, chunk)
+
+                    size = await self.api.download(file_path, write, self.timeout)
+                os.replace(temporary, path)
+            except BaseException:
+                try:
+                    os.remove(temporary)
+                except OSError:
+                    pass
+                raise
+        self._files[file_unique_id] = size
+        self.size += size
+        self._evict(file_unique_id)
+        return path
+
+    def _evict(self, keep: Optional[str] = None):
+        while self.size > self.max_size and self._files:
+            file_unique_id, size = next(iter(self._files.items()))
+            if file_unique_id == keep:
+                break
+            del self._files[file_unique_id]
+            self.size -= size
+            try:
+                os.remove(self.path(file_unique_id))
+            except FileNotFoundError:
+                pass
+
+    def remove(self, file_unique_id: str):
+        """
+        Deletes a file from the cache.
+
+        :param file_unique_id: Unique identifier of the file
+        """
+        size = self._files.pop(file_unique_id, None)
+        if size is not None:
+            self.size -= size
+            try:
+                os.remove(self.path(file_unique_id))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,123 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+class Histogram:
+    """
+    Histogram of non-negative integer values, e.g. durations in nanoseconds, in a fixed amount of memory.
+
+    Like an HdrHistogram, values below 2 ** precision are counted exactly and every higher power of two range is split
+    into 2 ** (precision - 1) buckets of equal width, so a value is reported with a relative error below
+    2 ** (1 - precision) (3% with the default precision of 6). Values of max_bits bits or more are counted
+    in the last bucket. Recording a value is a few integer operations, with no allocation.
+
+    http://hdrhistogram.org/
+    """
+
+    __slots__ = ("precision",
+                 "max_bits",
+                 "counts",
+                 "count",
+                 "sum",
+                 "max")
+
+    def __init__(self, precision: int = 6, max_bits: int = 40):
+        """
+        :param precision: Number of significant bits of recorded values
+        :param max_bits: Number of bits of the lowest value counted in the last bucket, 40 is 18 minutes in nanoseconds
+        """
+        self.precision = precision
+        self.max_bits = max_bits
+        self.counts = array("Q", bytes(8 * self._index((1 << max_bits) - 1) + 8))
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.precision
+        if shift <= 0:
+            return value
+        return (shift << (self.precision - 1)) + (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        half = 1 << (self.precision - 1)
+        if index < 2 * half:
+            return index
+        shift = index // half - 1
+        return ((index - (shift << (self.precision - 1)) + 1) << shift) - 1
+
+    def record(self, value: int):
+        """
+        Counts a value.
+
+        :param value: Non-negative integer
+        """
+        shift = value.bit_length() - self.precision
+        counts = self.counts
+        if shift <= 0:
+            counts[value] += 1
+        else:
+            index = (shift << (self.precision - 1)) + (value >> shift)
+            counts[index if index < len(counts) else -1] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Returns the value below or at which a percentage of the recorded values are.
+
+        :param percentile: Percentage between 0 and 100
+        :return: Highest value of the bucket holding the value, not above the maximum recorded value; 0 if empty
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -int(-percentile * self.count // 100))
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def buckets(self) -> Iterator[tuple[int, int]]:
+        """
+        Iterates over the buckets holding values.
+
+        :return: Iterator of the highest value and count of every non-empty bucket, in order
+        """
+        upper = self._upper
+        for index, count in enumerate(self.counts):
+            if count:
+                yield upper(index), count
+
+    def merge(self, other: Histogram):
+        """
+        Adds the values counted by another histogram with the same precision and max_bits.
+
+        :param other: Histogram
+        """
+        if (other.precision, other.max_bits) != (self.precision, self.max_bits):
+            raise ValueError("Histograms differ in precision or max_bits")
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        """
+        Forgets all recorded values.
+        """
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.count = 0
+        self.sum = 0
+        self.max = 0
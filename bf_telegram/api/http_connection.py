@@ -0,0 +1,266 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Optional, Union
+
+class HttpError(Exception):
+    """
+    Raised when a server sends a malformed HTTP message or closes the connection in the middle of one.
+    """
+
+class BodyTooLargeError(HttpError):
+    """
+    Raised when an HTTP message body is larger than the size allowed by the reader.
+    """
+
+class HttpResponse:
+    """
+    Response to an HTTP request.
+    """
+
+    __slots__ = ("status",
+                 "headers",
+                 "body")
+
+    def __init__(self, status: int, headers: dict[str, str], body: bytes):
+        """
+        :param status: Status code
+        :param headers: Headers with lowercase names
+        :param body: Body
+        """
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+async def read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    """
+    Reads HTTP header fields up to the empty line ending them.
+
+    :param reader: Stream positioned after the start line
+    :return: Headers with lowercase names
+    """
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.endswith(b"\n"):
+            raise HttpError("Connection closed while reading headers")
+        if line in (b"\r\n", b"\n"):
+            return headers
+        name, separator, value = line.decode("latin-1").partition(":")
+        if not separator:
+            raise HttpError(f"Malformed header line {line!r}")
+        headers[name.strip().lower()] = value.strip()
+
+async def read_body(reader: asyncio.StreamReader,
+                    headers: dict[str, str],
+                    until_eof: bool = False,
+                    max_size: Optional[int] = None) -> bytes:
+    """
+    Reads an HTTP message body delimited by Content-Length or chunked transfer coding.
+
+    :param reader: Stream positioned after the headers
+    :param headers: Headers of the message
+    :param until_eof: Read until the connection is closed if the message has no length (responses only)
+    :param max_size: Maximum size of the body in bytes, None for no limit; a larger body raises BodyTooLargeError
+                     before more than max_size bytes of it are read
+    :return: Body
+    """
+    limit = max_size if max_size is not None else float("inf")
+    try:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            total = 0
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    await read_headers(reader)
+                    return b"".join(chunks)
+                total += size
+                if total > limit:
+                    raise BodyTooLargeError(f"Body larger than {max_size} bytes")
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+        if "content-length" in headers:
+            size = int(headers["content-length"])
+            if size > limit:
+                raise BodyTooLargeError(f"Body larger than {max_size} bytes")
+            return await reader.readexactly(size)
+    except (ValueError, asyncio.IncompleteReadError) as error:
+        raise HttpError("Malformed or truncated body") from error
+    if not until_eof:
+        return b""
+    if max_size is None:
+        return await reader.read()
+    chunks = []
+    total = 0
+    while chunk := await reader.read(1 << 16):
+        total += len(chunk)
+        if total > max_size:
+            raise BodyTooLargeError(f"Body larger than {max_size} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def copy_body(reader: asyncio.StreamReader,
+                    headers: dict[str, str],
+                    write: Callable[[bytes], Any],
+                    until_eof: bool = False,
+                    chunk_size: int = 1 << 16):
+    """
+    Reads an HTTP message body like read_body(), passing it to a function in chunks instead of returning it.
+
+    :param reader: Stream positioned after the headers
+    :param headers: Headers of the message
+    :param write: Function called with every chunk of the body, awaited if it is a coroutine function, e.g. one
+                  writing to a file in a thread
+    :param until_eof: Read until the connection is closed if the message has no length (responses only)
+    :param chunk_size: Maximum size of a chunk
+    """
+    if not asyncio.iscoroutinefunction(write):
+        write = _awaitable(write)
+    try:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    await read_headers(reader)
+                    return
+                while size > 0:
+                    chunk = await reader.readexactly(min(size, chunk_size))
+                    await write(chunk)
+                    size -= len(chunk)
+                await reader.readexactly(2)
+        if "content-length" in headers:
+            size = int(headers["content-length"])
+            while size > 0:
+                chunk = await reader.readexactly(min(size, chunk_size))
+                await write(chunk)
+                size -= len(chunk)
+            return
+    except (ValueError, asyncio.IncompleteReadError) as error:
+        raise HttpError("Malformed or truncated body") from error
+    if until_eof:
+        while chunk := await reader.read(chunk_size):
+            await write(chunk)
+
+def _awaitable(function: Callable[[bytes], Any]) -> Callable[[bytes], Awaitable[Any]]:
+    async def call(chunk: bytes) -> Any:
+        return function(chunk)
+
+    return call
+
+class HttpConnection:
+    """
+    Persistent HTTP/1.1 client connection to a single host.
+    Requests are sent one at a time, the connection is kept alive between them unless the server closes it.
+    """
+
+    def __init__(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext] = None):
+        """
+        :param host: Host name
+        :param port: TCP port
+        :param ssl_context: TLS settings, None for plain HTTP
+        """
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        True, if the connection is established and can be reused, i.e. the server has not closed it.
+        """
+        return self._writer is not None and not self._writer.is_closing() and not self._reader.at_eof()
+
+    async def open(self, timeout: Optional[float] = None):
+        """
+        Establishes the connection.
+
+        :param timeout: Time limit for connecting in seconds
+        """
+        self.close()
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl_context), timeout)
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self,
+                      method: str,
+                      target: str,
+                      body: Union[bytes, Iterable[bytes], AsyncIterable[bytes]] = b"",
+                      headers: Optional[dict[str, str]] = None,
+                      timeout: Optional[float] = None,
+                      write: Optional[Callable[[bytes], Any]] = None) -> HttpResponse:
+        """
+        Sends a request and reads the response, opening the connection first if needed.
+        The connection is closed if the request fails or the server does not keep it alive.
+
+        :param method: Request method
+        :param target: Request target (path and query)
+        :param body: Request body, or a sized iterable of chunks, e.g. a MultipartBody, sent one at a time, iterated over
+                     asynchronously if it supports it
+        :param headers: Additional request headers
+        :param timeout: Time limit for connecting and for the whole exchange in seconds
+        :param write: Function the body of a successful (2xx) response is passed to in chunks instead of being
+                      returned in the response, so it is never held in memory whole
+        :return: Response
+        """
+        if not self.is_open:
+            await self.open(timeout)
+        try:
+            lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+            lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+            head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+            if isinstance(body, bytes):
+                # Written before the exchange task is created, so the request is sent without waiting for the caller
+                # to be suspended again
+                self._writer.write(head + body)
+            return await asyncio.wait_for(self._exchange(head, body, write), timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _exchange(self,
+                        head: bytes,
+                        body: Union[bytes, Iterable[bytes], AsyncIterable[bytes]],
+                        write: Optional[Callable[[bytes], Any]]) -> HttpResponse:
+        if not isinstance(body, bytes):
+            self._writer.write(head)
+            if hasattr(body, "__aiter__"):
+                async for chunk in body:
+                    self._writer.write(chunk)
+                    await self._writer.drain()
+            else:
+                for chunk in body:
+                    self._writer.write(chunk)
+                    await self._writer.drain()
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        try:
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HttpError(f"Malformed status line {status_line!r}") from None
+        response_headers = await read_headers(self._reader)
+        keep_alive = response_headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        if write is not None and 200 <= status < 300:
+            await copy_body(self._reader, response_headers, write, until_eof=not keep_alive)
+            response_body = b""
+        else:
+            response_body = await read_body(self._reader, response_headers, until_eof=not keep_alive)
+        if not keep_alive:
+            self.close()
+        return HttpResponse(status, response_headers, response_body)
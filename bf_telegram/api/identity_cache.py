@@ -0,0 +1,129 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from .user import User
+from .chat import Chat
+from .message import Message
+from .update import Update
+from .decoder import NESTED, attributes, blank, decoder, derived_decoder, wire_name
+
+INTERNED = frozenset(("first_name", "last_name", "username", "language_code", "type", "title"))
+"""
+Fields of users and chats whose values are interned.
+"""
+
+CHAT_FIELDS = frozenset(("type", "title", "username", "first_name", "last_name", "is_forum"))
+"""
+Fields of chats received with every chat. A chat seen again without one of them has it reset to None, while the
+fields returned by getChat alone keep their previous values. All fields of users are reset.
+"""
+
+def _clearer(names: Iterable[str]) -> Callable[[Any], None]:
+    namespace = {}
+    exec(compile(f"def clear(o): o.{' = o.'.join(names)} = None", "<identity cache>", "exec"), namespace)
+    return namespace["clear"]
+
+class IdentityCache:
+    """
+    Keeps one shared User per user and one shared Chat per chat across decoded updates.
+
+    A user or chat seen again is updated in place with the fields it was received with and returned instead of a new
+    object, so handlers keeping a reference always see its latest known state. Fields missing from a later object
+    are reset to None, except the fields of chats returned by getChat alone, which keep their previous values,
+    see CHAT_FIELDS. Repeated strings (names, usernames, language codes, chat types) are interned.
+    Both caches are LRU-evicted beyond max_size entries. Groups migrated to supergroups are not remapped, the group
+    and the supergroup have a Chat each.
+    """
+
+    def __init__(self, max_size: int = 100000):
+        """
+        :param max_size: Maximum number of users and of chats kept
+        """
+        self.max_size = max_size
+        self.users: OrderedDict[int, User] = OrderedDict()
+        self.chats: OrderedDict[int, Chat] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._user_names = {wire_name(attribute): attribute for attribute in attributes(User)}
+        self._chat_names = {wire_name(attribute): attribute for attribute in attributes(Chat)}
+        self._clear_user = _clearer(attributes(User))
+        self._clear_chat = _clearer([name for key, name in self._chat_names.items() if key in CHAT_FIELDS])
+        self._decode_message = derived_decoder(Message, {User: self.user, Chat: self.chat, Message: self.message})
+        self._decode_update = derived_decoder(Update, {Message: self._decode_message})
+
+    def _get(self, cache: OrderedDict, cls: type, names: dict[str, str], clear: Callable[[Any], None],
+             data: dict) -> Any:
+        key = data["id"]
+        instance = cache.get(key)
+        if instance is None:
+            self.misses += 1
+            instance = cache[key] = blank(cls)
+            if len(cache) > self.max_size:
+                cache.popitem(last=False)
+        else:
+            self.hits += 1
+            cache.move_to_end(key)
+            clear(instance)
+        nested = NESTED[cls]
+        for key, value in data.items():
+            name = names.get(key)
+            if name is None:
+                continue
+            if key in INTERNED and type(value) is str:
+                value = sys.intern(value)
+            elif key in nested and value is not None:
+                value = decoder(nested[key])(value)
+            setattr(instance, name, value)
+        return instance
+
+    def user(self, data: dict) -> User:
+        """
+        Returns the shared User for a decoded JSON object, updating it with the received fields.
+
+        :param data: Decoded JSON object of the user
+        :return: Shared user
+        """
+        return self._get(self.users, User, self._user_names, self._clear_user, data)
+
+    def chat(self, data: dict) -> Chat:
+        """
+        Returns the shared Chat for a decoded JSON object, updating it with the received fields.
+
+        :param data: Decoded JSON object of the chat
+        :return: Shared chat
+        """
+        return self._get(self.chats, Chat, self._chat_names, self._clear_chat, data)
+
+    def message(self, data: dict) -> Message:
+        """
+        Decodes a message, using shared users and chats for its sender, chat, forward origin, members and replies.
+
+        :param data: Decoded JSON object of the message
+        :return: Message
+        """
+        return self._decode_message(data)
+
+    def update(self, data: dict) -> Update:
+        """
+        Decodes an update, using shared users and chats in its messages.
+
+        :param data: Decoded JSON object of the update
+        :return: Update
+        """
+        return self._decode_update(data)
+
+    def decode_updates(self, result: Iterable[dict]) -> list[Update]:
+        """
+        Decodes the result of a getUpdates call or a batch of webhook bodies, using shared users and chats.
+
+        :param result: Decoded JSON array of updates
+        :return: List of updates
+        """
+        return list(map(self._decode_update, result))
@@ -0,0 +1,175 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import uuid
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Union
+
+class InputFile:
+    """
+    This object represents the contents of a file to be uploaded. Must be posted using multipart/form-data in the
+    usual way that files are uploaded via the browser.
+
+    The contents are read from a path, a seekable binary file object or an in-memory buffer only while the request is
+    being sent, in chunks, so a file is never held in memory whole. In-memory buffers are sent without copying.
+    The size is known without reading the contents.
+
+    https://core.telegram.org/bots/api#inputfile
+    """
+
+    __slots__ = ("source",
+                 "filename",
+                 "content_type",
+                 "_offset",
+                 "_digest")
+
+    def __init__(self,
+                 source: Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO],
+                 filename: Optional[str] = None,
+                 content_type: str = "application/octet-stream"):
+        """
+        :param source: Path of the file, binary file object positioned at the start of the contents, or the contents
+        :param filename: File name sent to Telegram, defaults to the base name of the path or file object
+        :param content_type: MIME type of the contents
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = os.fspath(source)
+        self.source = source
+        if filename is None:
+            name = source if isinstance(source, str) else getattr(source, "name", None)
+            filename = os.path.basename(name) if isinstance(name, str) else "file"
+        self.filename = filename
+        self.content_type = content_type
+        self._offset = source.tell() if isinstance(source, io.IOBase) else 0
+        self._digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        """
+        Returns the size of the contents in bytes without reading them.
+        """
+        source = self.source
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return memoryview(source).nbytes
+        try:
+            return os.fstat(source.fileno()).st_size - self._offset
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            position = source.tell()
+            size = source.seek(0, io.SEEK_END)
+            source.seek(position)
+            return size - self._offset
+
+    def chunks(self, chunk_size: int = 1 << 18) -> Iterator[Union[bytes, memoryview]]:
+        """
+        Iterates over the contents. Every iteration starts at the beginning.
+
+        :param chunk_size: Maximum size of a chunk
+        :return: Iterator of chunks
+        """
+        source = self.source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source).cast("B")
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size]
+            return
+        if isinstance(source, str):
+            with open(source, "rb", buffering=0) as file:
+                while chunk := file.read(chunk_size):
+                    yield chunk
+            return
+        source.seek(self._offset)
+        while chunk := source.read(chunk_size):
+            yield chunk
+
+    async def async_chunks(self, chunk_size: int = 1 << 18) -> AsyncIterator[Union[bytes, memoryview]]:
+        """
+        Iterates over the contents like chunks, reading files in a thread so a slow disk does not stall the event loop.
+        In-memory buffers are sliced directly.
+
+        :param chunk_size: Maximum size of a chunk
+        :return: Asynchronous iterator of chunks
+        """
+        chunks = self.chunks(chunk_size)
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            for chunk in chunks:
+                yield chunk
+            return
+        try:
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                yield chunk
+        finally:
+            chunks.close()
+
+    def digest(self) -> str:
+        """
+        Returns the SHA-256 hash of the contents, computed on first use.
+
+        :return: Hexadecimal digest
+        """
+        if self._digest is None:
+            hash_ = hashlib.sha256()
+            for chunk in self.chunks():
+                hash_.update(chunk)
+            self._digest = hash_.hexdigest()
+        return self._digest
+
+class MultipartBody:
+    """
+    multipart/form-data request body streaming the contents of its files.
+    Its length is computed without reading the files, it can be iterated over again to repeat a request.
+    Iterating over it asynchronously reads the files in a thread.
+    """
+
+    __slots__ = ("boundary",
+                 "parts")
+
+    def __init__(self, fields: dict[str, Union[str, InputFile]]):
+        """
+        :param fields: Form fields, string values or files
+        """
+        self.boundary = uuid.uuid4().hex
+        self.parts: list[Union[bytes, InputFile]] = []
+        for name, value in fields.items():
+            name = name.replace('"', "%22")
+            if isinstance(value, InputFile):
+                filename = value.filename.replace('"', "%22").replace("\r", "").replace("\n", "")
+                self.parts.append(f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                                  f'filename="{filename}"\r\nContent-Type: {value.content_type}\r\n\r\n'.encode())
+                self.parts.append(value)
+                self.parts.append(b"\r\n")
+            else:
+                self.parts.append(f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                                  f'{value}\r\n'.encode())
+        self.parts.append(f"--{self.boundary}--\r\n".encode())
+
+    @property
+    def content_type(self) -> str:
+        """
+        Value of the Content-Type header.
+        """
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return sum(map(len, self.parts))
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        for part in self.parts:
+            if isinstance(part, InputFile):
+                yield from part.chunks()
+            else:
+                yield part
+
+    async def __aiter__(self) -> AsyncIterator[Union[bytes, memoryview]]:
+        for part in self.parts:
+            if isinstance(part, InputFile):
+                async for chunk in part.async_chunks():
+                    yield chunk
+            else:
+                yield part
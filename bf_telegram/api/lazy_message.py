@@ -0,0 +1,60 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, get_args, get_origin
+
+from .message import Message
+from .update import Update
+from .decoder import NESTED, attributes, decoder, derived_decoder, wire_name
+
+class LazyMessage(Message):
+    """
+    Message that keeps the decoded JSON object it was received as and builds each field on first access.
+    Nested objects that are never read (chats, users, photo sizes, replied and pinned messages...) are never created.
+    Built fields are cached in their slots.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        """
+        :param data: Decoded JSON object of the message as received from the Bot API
+        """
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            factory = _factories[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        value = self._data.get(wire_name(name))
+        if value is not None and factory is not None:
+            value = factory(value)
+        setattr(self, name, value)
+        return value
+
+def _factory(type_: Any) -> Callable[[Any], Any]:
+    if type_ is Message:
+        return LazyMessage
+    if get_origin(type_) is list:
+        item = decoder(get_args(type_)[0])
+        return lambda items: list(map(item, items))
+    return decoder(type_)
+
+_factories: dict[str, Any] = {attribute: None for attribute in attributes(Message)}
+_factories.update({attribute: _factory(NESTED[Message][wire_name(attribute)])
+                   for attribute in _factories if wire_name(attribute) in NESTED[Message]})
+
+decode_lazy_update = derived_decoder(Update, {Message: LazyMessage})
+
+def decode_lazy_updates(result: Iterable[dict]) -> list[Update]:
+    """
+    Decodes the result of a getUpdates call or a batch of webhook bodies, using LazyMessage for all messages.
+
+    :param result: Decoded JSON array of updates
+    :return: List of updates
+    """
+    return list(map(decode_lazy_update, result))
@@ -0,0 +1,106 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from .bot_api import BotApi, BotApiError
+from .http_connection import HttpError
+from .update import Update
+from .decoder import decode_updates
+
+class LongPolling:
+    """
+    Receives updates with getUpdates in a loop and passes them to a handler in order.
+
+    The next request is sent as soon as a batch arrives, with the offset following its highest update_id,
+    so it is already waiting on the server while the batch is decoded and handled.
+    Note that this confirms the batch to Telegram before it is handled.
+
+    https://core.telegram.org/bots/api#getupdates
+    """
+
+    def __init__(self,
+                 api: BotApi,
+                 handler: Callable[[Update], Awaitable[Any]],
+                 timeout: int = 50,
+                 limit: int = 100,
+                 allowed_updates: Optional[list[str]] = None,
+                 offset: Optional[int] = None,
+                 decode: Callable[[list[dict]], list[Update]] = decode_updates,
+                 retry_delay: float = 1,
+                 max_retry_delay: float = 60):
+        """
+        :param api: Bot API client
+        :param handler: Coroutine function called with every update, awaited before the next update is handled
+        :param timeout: Long polling timeout in seconds
+        :param limit: Maximum number of updates per request, 1-100
+        :param allowed_updates: Update types to receive, None to keep the previous setting
+        :param offset: Identifier of the first update to receive, None to start with the earliest unconfirmed one
+        :param decode: Function decoding a batch of updates, e.g. decode_lazy_updates
+        :param retry_delay: Delay before repeating a failed request in seconds, doubled after every consecutive failure
+        :param max_retry_delay: Maximum delay before repeating a failed request in seconds
+        """
+        self.api = api
+        self.handler = handler
+        self.timeout = timeout
+        self.limit = limit
+        self.allowed_updates = allowed_updates
+        self.offset = offset
+        self.decode = decode
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._running = False
+        self._request: Optional[asyncio.Task] = None
+
+    async def _fetch(self, offset: Optional[int]) -> list[dict]:
+        delay = self.retry_delay
+        while True:
+            try:
+                return await self.api.call("getUpdates",
+                                           {"offset": offset,
+                                            "limit": self.limit,
+                                            "timeout": self.timeout,
+                                            "allowed_updates": self.allowed_updates},
+                                           self.api.timeout + self.timeout)
+            except BotApiError as error:
+                if error.retry_after is None and error.error_code < 500:
+                    raise
+                await asyncio.sleep(error.retry_after or delay)
+            except (HttpError, OSError, asyncio.TimeoutError):
+                await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    async def run(self):
+        """
+        Receives and handles updates until stop() is called or the handler raises an exception.
+        """
+        self._running = True
+        self._request = asyncio.ensure_future(self._fetch(self.offset))
+        try:
+            while self._running:
+                result = await self._request
+                if result:
+                    self.offset = max(update["update_id"] for update in result) + 1
+                self._request = asyncio.ensure_future(self._fetch(self.offset))
+                # Lets the request be sent before handlers run, as they may not suspend until the batch is handled
+                await asyncio.sleep(0)
+                for update in self.decode(result):
+                    await self.handler(update)
+        except asyncio.CancelledError:
+            if self._running:
+                raise
+        finally:
+            self._running = False
+            self._request.cancel()
+
+    def stop(self):
+        """
+        Stops receiving updates. The pending request is cancelled, updates already received are still handled.
+        """
+        self._running = False
+        if self._request is not None:
+            self._request.cancel()
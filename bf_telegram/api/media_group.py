@@ -0,0 +1,148 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from .chat import Chat
+from .message import Message
+
+logger = logging.getLogger(__name__)
+
+class MediaGroup:
+    """
+    Messages of an album, sharing a media_group_id.
+    """
+
+    __slots__ = ("media_group_id",
+                 "messages",
+                 "started",
+                 "updated",
+                 "_timer")
+
+    def __init__(self, media_group_id: str, started: float):
+        """
+        :param media_group_id: Identifier of the media group
+        :param started: Time the first message was received
+        """
+        self.media_group_id = media_group_id
+        self.messages: list[Message] = []
+        self.started = started
+        self.updated = started
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def chat(self) -> Chat:
+        """
+        Chat the album was sent to.
+        """
+        return self.messages[0].chat
+
+    @property
+    def caption(self) -> Optional[str]:
+        """
+        Caption of the album, i.e. the first caption of its messages.
+        """
+        return next((message.caption for message in self.messages if message.caption is not None), None)
+
+class MediaGroupAggregator:
+    """
+    Collects the messages of albums, which Telegram delivers as separate messages, and passes every album to a handler
+    once.
+
+    An album is passed when no message of it was received for delay seconds, when it has max_size messages,
+    when max_wait seconds passed since its first message or when more than max_groups albums are pending,
+    in which case the oldest one is passed. Messages are ordered by message_id. A message arriving after its album
+    was passed starts a new album.
+    """
+
+    def __init__(self,
+                 handler: Callable[[MediaGroup], Awaitable[Any]],
+                 delay: float = 0.5,
+                 max_wait: float = 5,
+                 max_size: int = 10,
+                 max_groups: int = 10000):
+        """
+        :param handler: Coroutine function called with every album
+        :param delay: Time to wait for the next message of an album in seconds
+        :param max_wait: Maximum time to hold an album in seconds
+        :param max_size: Number of messages completing an album, 10 is the maximum allowed by Telegram
+        :param max_groups: Maximum number of albums held at a time
+        """
+        self.handler = handler
+        self.delay = delay
+        self.max_wait = max_wait
+        self.max_size = max_size
+        self.max_groups = max_groups
+        self.evicted = 0
+        self._groups: OrderedDict[tuple[int, str], MediaGroup] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of albums held.
+        """
+        return len(self._groups)
+
+    def put(self, message: Message) -> bool:
+        """
+        Accepts a received message if it is a part of an album.
+
+        :param message: Received message
+        :return: True, if the message is a part of an album and was accepted
+        """
+        media_group_id = message.media_group_id
+        if media_group_id is None:
+            return False
+        now = time.monotonic()
+        key = (message.chat.id if message.chat is not None else 0, media_group_id)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = MediaGroup(media_group_id, now)
+            if len(self._groups) > self.max_groups:
+                self.evicted += 1
+                self._pass(*next(iter(self._groups.items())))
+        group.messages.append(message)
+        group.updated = now
+        if group._timer is not None:
+            group._timer.cancel()
+        if len(group.messages) >= self.max_size:
+            self._pass(key, group)
+        else:
+            delay = min(self.delay, group.started + self.max_wait - now)
+            group._timer = asyncio.get_running_loop().call_later(max(delay, 0), self._pass, key, group)
+        return True
+
+    def _pass(self, key: tuple[int, str], group: MediaGroup):
+        if self._groups.get(key) is not group:
+            return
+        del self._groups[key]
+        if group._timer is not None:
+            group._timer.cancel()
+            group._timer = None
+        group.messages.sort(key=lambda message: message.message_id)
+        task = asyncio.ensure_future(self._handle(group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, group: MediaGroup):
+        try:
+            await self.handler(group)
+        except Exception:
+            logger.exception("Media group %s handler failed", group.media_group_id)
+
+    async def flush(self):
+        """
+        Passes all held albums to the handler and waits until all albums are handled.
+        """
+        for key, group in list(self._groups.items()):
+            self._pass(key, group)
+        while self._tasks:
+            await asyncio.wait(set(self._tasks))
@@ -2,25 +2,100 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-from user import User
-from chat import Chat
-from message_entity import MessageEntity
-from photo_size import PhotoSize
-from animation import Animation
-from audio import Audio
-from document import Document
-from video import Video
-from video_note import VideoNote
+from .telegram_object import TelegramObject
+from .user import User
+from .chat import Chat
+from .message_entity import MessageEntity
+from .photo_size import PhotoSize
+from .animation import Animation
+from .audio import Audio
+from .document import Document
+from .video import Video
+from .video_note import VideoNote
 
-class Message:
+class Message(TelegramObject):
     """
     This object represents a message.
 
     https://core.telegram.org/bots/api#message
     """
 
+    __slots__ = ("message_id",
+                 "message_thread_id",
+                 "from_",
+                 "sender_chat",
+                 "date",
+                 "chat",
+                 "forward_from",
+                 "forward_from_chat",
+                 "forward_from_message_id",
+                 "forward_signature",
+                 "forward_sender_name",
+                 "forward_date",
+                 "is_topic_message",
+                 "is_automatic_forward",
+                 "reply_to_message",
+                 "via_bot",
+                 "edit_date",
+                 "has_protected_content",
+                 "media_group_id",
+                 "author_signature",
+                 "text",
+                 "entities",
+                 "animation",
+                 "audio",
+                 "document",
+                 "photo",
+                 "sticker",
+                 "video",
+                 "video_note",
+                 "voice",
+                 "caption",
+                 "caption_entities",
+                 "has_media_spoiler",
+                 "contact",
+                 "dice",
+                 "game",
+                 "poll",
+                 "venue",
+                 "location",
+                 "new_chat_members",
+                 "left_chat_member",
+                 "new_chat_title",
+                 "new_chat_photo",
+                 "delete_chat_photo",
+                 "group_chat_created",
+                 "supergroup_chat_created",
+                 "channel_chat_created",
+                 "message_auto_delete_timer_changed",
+                 "migrate_to_chat_id",
+                 "migrate_from_chat_id",
+                 "pinned_message",
+                 "invoice",
+                 "successful_payment",
+                 "user_shared",
+                 "chat_shared",
+                 "connected_website",
+                 "write_access_allowed",
+                 "passport_data",
+                 "proximity_alert_triggered",
+                 "forum_topic_created",
+                 "forum_topic_edited",
+                 "forum_topic_closed",
+                 "forum_topic_reopened",
+                 "general_forum_topic_hidden",
+                 "general_forum_topic_unhidden",
+                 "video_chat_scheduled",
+                 "video_chat_started",
+                 "video_chat_ended",
+                 "video_chat_participants_invited",
+                 "web_app_data",
+                 "reply_markup")
+
     def __init__(self,
                  message_id: int,
                  message_thread_id: Optional[int] = None,
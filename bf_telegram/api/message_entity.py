@@ -2,17 +2,28 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-from user import User
+from .telegram_object import TelegramObject
+from .user import User
 
-class MessageEntity:
+class MessageEntity(TelegramObject):
     """
     This object represents one special entity in a text message. For example, hashtags, usernames, URLs, etc.
 
     https://core.telegram.org/bots/api#messageentity
     """
 
+    __slots__ = ("type",
+                 "offset",
+                 "length",
+                 "url",
+                 "user",
+                 "language",
+                 "custom_emoji_id")
+
     def __init__(self,
                  type: str,
                  offset: int,
@@ -2,13 +2,19 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-class MessageId:
+from __future__ import annotations
+
+from .telegram_object import TelegramObject
+
+class MessageId(TelegramObject):
     """
     This object represents a unique message identifier.
 
     https://core.telegram.org/bots/api#messageid
     """
 
+    __slots__ = ("message_id",)
+
     def __init__(self, message_id: int):
         """
         :param message_id: 	Unique message identifier 
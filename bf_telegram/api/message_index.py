@@ -0,0 +1,223 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Optional
+
+from .message import Message
+from .update import Update
+
+class _Entry:
+    __slots__ = ("message",
+                 "added")
+
+    def __init__(self, message: Message, added: float):
+        self.message = message
+        self.added = added
+
+class _ChatMessages:
+    __slots__ = ("messages",
+                 "threads")
+
+    def __init__(self):
+        self.messages: dict[int, _Entry] = {}
+        self.threads: dict[int, deque[int]] = {}
+
+class MessageIndex:
+    """
+    Keeps the recent messages of every chat by message_id, so reply chains and forum topic histories are resolved
+    without API calls.
+
+    A reply chain is followed through reply_to_message, which Telegram includes only one level deep, to the indexed
+    replied message, in O(depth). Messages with a message_thread_id are kept per thread in the order indexed.
+    An edited message replaces the indexed one, keeping its place. Messages are evicted in the order indexed when
+    more than max_messages are indexed, when a chat has more than max_per_chat, and when older than ttl seconds.
+    Groups migrated to supergroups are not remapped: the messages of the group stay indexed under its identifier,
+    separately from the supergroup's, whose message identifiers are a different sequence.
+    """
+
+    def __init__(self, max_messages: int = 1000000, max_per_chat: int = 10000, ttl: Optional[float] = 86400):
+        """
+        :param max_messages: Maximum number of messages indexed
+        :param max_per_chat: Maximum number of messages indexed per chat
+        :param ttl: Time after which a message is evicted in seconds, None to evict messages by size only
+        """
+        self.max_messages = max_messages
+        self.max_per_chat = max_per_chat
+        self.ttl = ttl
+        self.evicted = 0
+        self._chats: dict[int, _ChatMessages] = {}
+        self._count = 0
+        # Indexed time, chat and message_id of every indexed message, in order; entries of messages evicted
+        # by max_per_chat or indexed again since are skipped when they reach the head
+        self._order: deque[tuple[float, int, int]] = deque()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def put(self, message: Message):
+        """
+        Indexes a received or edited message. The message it replies to is indexed too if missing.
+
+        :param message: Received message
+        """
+        if message.chat is None:
+            return
+        now = time.monotonic()
+        chat_id = message.chat.id
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            chat = self._chats[chat_id] = _ChatMessages()
+        parent = message.reply_to_message
+        if parent is not None and parent.message_id not in chat.messages:
+            self._insert(chat_id, chat, parent, now)
+        self._insert(chat_id, chat, message, now)
+        self._evict(now)
+
+    def _insert(self, chat_id: int, chat: _ChatMessages, message: Message, now: float):
+        message_id = message.message_id
+        messages = chat.messages
+        entry = messages.get(message_id)
+        if entry is not None:
+            entry.message = message
+            return
+        messages[message_id] = _Entry(message, now)
+        self._count += 1
+        self._order.append((now, chat_id, message_id))
+        thread_id = message.message_thread_id
+        if thread_id is not None:
+            thread = chat.threads.get(thread_id)
+            if thread is None:
+                thread = chat.threads[thread_id] = deque()
+            thread.append(message_id)
+        if len(messages) > self.max_per_chat:
+            self._remove(chat_id, chat, next(iter(messages)))
+
+    def _remove(self, chat_id: int, chat: _ChatMessages, message_id: int):
+        message = chat.messages.pop(message_id).message
+        self._count -= 1
+        self.evicted += 1
+        thread_id = message.message_thread_id
+        if thread_id is not None:
+            thread = chat.threads[thread_id]
+            # Messages leave a chat in the order they were indexed
+            if thread[0] == message_id:
+                thread.popleft()
+            else:
+                thread.remove(message_id)
+            if not thread:
+                del chat.threads[thread_id]
+        if not chat.messages:
+            del self._chats[chat_id]
+
+    def _indexed(self, added: float, chat_id: int, message_id: int) -> bool:
+        chat = self._chats.get(chat_id)
+        entry = chat.messages.get(message_id) if chat is not None else None
+        return entry is not None and entry.added == added
+
+    def _evict(self, now: float):
+        order = self._order
+        expired = now - self.ttl if self.ttl is not None else None
+        while order and (self._count > self.max_messages or expired is not None and order[0][0] < expired):
+            added, chat_id, message_id = order.popleft()
+            if self._indexed(added, chat_id, message_id):
+                self._remove(chat_id, self._chats[chat_id], message_id)
+        if len(order) > 2 * self.max_messages:
+            self._order = deque(item for item in order if self._indexed(*item))
+
+    def expire(self):
+        """
+        Evicts the messages older than ttl seconds, which is also done whenever a message is indexed.
+        """
+        self._evict(time.monotonic())
+
+    def apply_update(self, update: Update):
+        """
+        Indexes the message, edited message, channel post or edited channel post of an update.
+
+        :param update: Received update
+        """
+        message = update.message or update.edited_message or update.channel_post or update.edited_channel_post
+        if message is not None:
+            self.put(message)
+
+    def get(self, chat_id: int, message_id: int) -> Optional[Message]:
+        """
+        Returns an indexed message.
+
+        :param chat_id: Identifier of the chat
+        :param message_id: Identifier of the message in the chat
+        :return: Message, None if it is not indexed
+        """
+        chat = self._chats.get(chat_id)
+        entry = chat.messages.get(message_id) if chat is not None else None
+        return entry.message if entry is not None else None
+
+    def parent(self, message: Message) -> Optional[Message]:
+        """
+        Returns the message a message replies to, as indexed if it is, so its own reply_to_message is available.
+
+        :param message: Message
+        :return: Replied message, None if the message is not a reply
+        """
+        parent = message.reply_to_message
+        if parent is None:
+            return None
+        return self.get(message.chat.id, parent.message_id) or parent
+
+    def chain(self, chat_id: int, message_id: int, max_depth: Optional[int] = None) -> list[Message]:
+        """
+        Returns the reply chain ending with a message.
+
+        :param chat_id: Identifier of the chat
+        :param message_id: Identifier of the last message of the chain
+        :param max_depth: Maximum number of messages returned, None for no limit
+        :return: The message, the message it replies to and so on, up to the first message not indexed;
+                 empty if the message is not indexed
+        """
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            return []
+        messages = chat.messages
+        entry = messages.get(message_id)
+        result = []
+        while entry is not None and (max_depth is None or len(result) < max_depth):
+            message = entry.message
+            result.append(message)
+            parent = message.reply_to_message
+            if parent is None:
+                break
+            entry = messages.get(parent.message_id)
+            if entry is None and (max_depth is None or len(result) < max_depth):
+                # Not indexed, known only as received, without its own reply_to_message
+                result.append(parent)
+        return result
+
+    def thread(self, chat_id: int, thread_id: int) -> list[Message]:
+        """
+        Returns the indexed messages of a message thread, e.g. a forum topic.
+
+        :param chat_id: Identifier of the chat
+        :param thread_id: Identifier of the message thread
+        :return: Messages of the thread in the order they were indexed
+        """
+        chat = self._chats.get(chat_id)
+        thread = chat.threads.get(thread_id) if chat is not None else None
+        if thread is None:
+            return []
+        messages = chat.messages
+        return [messages[message_id].message for message_id in thread]
+
+    def remove_chat(self, chat_id: int):
+        """
+        Removes the messages of a chat, e.g. after the bot was removed from it.
+
+        :param chat_id: Identifier of the chat
+        """
+        chat = self._chats.pop(chat_id, None)
+        if chat is not None:
+            self._count -= len(chat.messages)
@@ -0,0 +1,111 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import os
+from typing import Any, Optional, Union
+
+from .message import Message
+from .update import Update
+
+class MigrationTracker:
+    """
+    Maps identifiers of groups migrated to supergroups to the identifiers of the supergroups.
+
+    Migrations are learned from migrate_to_chat_id and migrate_from_chat_id service messages and from errors answered
+    to requests sent to a migrated group. A lookup is a dict access. If a path is given, migrations are appended to
+    it as they are learned and loaded again when the tracker is created.
+
+    Sender, ChatStore and Dispatcher take a tracker and remap migrated identifiers. IdentityCache and MessageIndex
+    do not: the group and the supergroup stay separate chats there, with their own Chat object and message history.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: File keeping the migrations, None to keep them in memory only
+        """
+        self.path = path
+        self._chat_ids: dict[int, int] = {}
+        self._file: Optional[Any] = None
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="ascii") as file:
+                for line in file:
+                    try:
+                        old_id, new_id = map(int, line.split())
+                    except ValueError:
+                        continue  # A line cut off by a crash
+                    self._chat_ids[old_id] = new_id
+
+    def __len__(self) -> int:
+        return len(self._chat_ids)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._chat_ids
+
+    def get(self, chat_id: Union[int, str]) -> Optional[int]:
+        """
+        Returns the identifier of the supergroup a group migrated to.
+
+        :param chat_id: Identifier of the chat
+        :return: Identifier of the supergroup, None if the chat did not migrate
+        """
+        return self._chat_ids.get(chat_id)
+
+    def resolve(self, chat_id: Union[int, str]) -> Union[int, str]:
+        """
+        Returns the current identifier of a chat.
+
+        :param chat_id: Identifier of the chat
+        :return: Identifier of the supergroup if the chat migrated, chat_id otherwise
+        """
+        return self._chat_ids.get(chat_id, chat_id)
+
+    def put(self, old_id: int, new_id: int):
+        """
+        Records a migration.
+
+        :param old_id: Identifier of the group
+        :param new_id: Identifier of the supergroup
+        """
+        if self._chat_ids.get(old_id) == new_id:
+            return
+        self._chat_ids[old_id] = new_id
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="ascii")
+            self._file.write(f"{old_id} {new_id}\n")
+            self._file.flush()
+
+    def apply(self, message: Message) -> bool:
+        """
+        Records the migration a received service message announces.
+
+        :param message: Received message
+        :return: True, if the message announces a migration
+        """
+        if message.migrate_to_chat_id is not None:
+            self.put(message.chat.id, message.migrate_to_chat_id)
+        elif message.migrate_from_chat_id is not None:
+            self.put(message.migrate_from_chat_id, message.chat.id)
+        else:
+            return False
+        return True
+
+    def apply_update(self, update: Update) -> bool:
+        """
+        Records the migration the message of a received update announces.
+
+        :param update: Received update
+        :return: True, if the update announces a migration
+        """
+        return update.message is not None and self.apply(update.message)
+
+    def close(self):
+        """
+        Closes the file keeping the migrations.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
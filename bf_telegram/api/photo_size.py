@@ -2,15 +2,25 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-class PhotoSize:
+from .telegram_object import TelegramObject
+
+class PhotoSize(TelegramObject):
     """
     This object represents one size of a photo or a file / sticker thumbnail.
 
     https://core.telegram.org/bots/api#photosize
     """
 
+    __slots__ = ("file_id",
+                 "file_unique_id",
+                 "width",
+                 "height",
+                 "file_size")
+
     def __init__(self, file_id: str, file_unique_id: str, width: int, height: int, file_size: Optional[int] = None):
         """
         :param file_id: Identifier for this file, which can be used to download or reuse the file
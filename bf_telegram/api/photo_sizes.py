@@ -0,0 +1,182 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Optional
+
+from .photo_size import PhotoSize
+from .message import Message
+
+CACHE_SIZE = 4096
+"""
+Number of indexes kept by PhotoSizes.of, so repeated lookups on the same messages reuse their index.
+"""
+
+_cache: dict[int, tuple[Any, PhotoSizes]] = {}
+
+class PhotoSizes:
+    """
+    Index of the sizes of a photo or of the thumbnails of a message, selecting a size in O(log n).
+
+    Sizes are sorted once by their longer side, by file size and by aspect ratio. Sizes without a file_size are
+    never selected by a byte budget. The indexes of the last CACHE_SIZE photos and thumbnails looked up with of()
+    are kept, keyed by the identity of the photo list or thumbnail, which are not expected to change once received.
+    """
+
+    __slots__ = ("sizes",
+                 "_sides",
+                 "_by_bytes",
+                 "_bytes",
+                 "_by_aspect",
+                 "_aspects")
+
+    def __init__(self, sizes: Iterable[PhotoSize]):
+        """
+        :param sizes: Sizes, e.g. Message.photo
+        """
+        self.sizes = sorted(sizes, key=lambda size: (max(size.width, size.height), size.width * size.height))
+        self._sides = [max(size.width, size.height) for size in self.sizes]
+        self._by_bytes = sorted((size for size in self.sizes if size.file_size is not None),
+                                key=lambda size: size.file_size)
+        self._bytes = [size.file_size for size in self._by_bytes]
+        self._by_aspect = sorted(self.sizes, key=lambda size: size.width / max(size.height, 1))
+        self._aspects = [size.width / max(size.height, 1) for size in self._by_aspect]
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __bool__(self) -> bool:
+        return bool(self.sizes)
+
+    @classmethod
+    def of(cls, message: Message) -> PhotoSizes:
+        """
+        Indexes the photo of a message or, if it has none, the thumbnail of its animation, audio, document, video
+        or video note.
+
+        :param message: Message
+        :return: Index, empty if the message has no photo or thumbnail
+        """
+        source = message.photo
+        if not source:
+            for media in (message.animation, message.video, message.document, message.video_note, message.audio):
+                if media is not None and media.thumb is not None:
+                    source = media.thumb
+                    break
+            else:
+                return cls(())
+        entry = _cache.get(id(source))
+        # The source is kept in the entry, so its identifier is not reused by another object while cached
+        if entry is not None and entry[0] is source and type(entry[1]) is cls:
+            return entry[1]
+        index = cls(source if isinstance(source, list) else (source,))
+        if len(_cache) >= CACHE_SIZE:
+            del _cache[next(iter(_cache))]
+        _cache[id(source)] = (source, index)
+        return index
+
+    def largest(self) -> Optional[PhotoSize]:
+        """
+        Returns the largest size.
+        """
+        return self.sizes[-1] if self.sizes else None
+
+    def smallest(self) -> Optional[PhotoSize]:
+        """
+        Returns the smallest size.
+        """
+        return self.sizes[0] if self.sizes else None
+
+    def fitting(self, max_side: int) -> Optional[PhotoSize]:
+        """
+        Returns the largest size whose width and height do not exceed a limit, or the smallest size if none fits.
+
+        :param max_side: Maximum width and height in pixels
+        """
+        if not self.sizes:
+            return None
+        return self.sizes[max(bisect_right(self._sides, max_side) - 1, 0)]
+
+    def at_least(self, min_side: int) -> Optional[PhotoSize]:
+        """
+        Returns the smallest size whose longer side reaches a limit, or the largest size if none does.
+
+        :param min_side: Minimum length of the longer side in pixels
+        """
+        if not self.sizes:
+            return None
+        return self.sizes[min(bisect_left(self._sides, min_side), len(self.sizes) - 1)]
+
+    def closest(self, side: int) -> Optional[PhotoSize]:
+        """
+        Returns the size whose longer side is closest to a length, the larger one on a tie.
+
+        :param side: Length of the longer side in pixels
+        """
+        index = bisect_left(self._sides, side)
+        if index == len(self.sizes):
+            return self.largest()
+        if index > 0 and side - self._sides[index - 1] < self._sides[index] - side:
+            index -= 1
+        return self.sizes[index]
+
+    def within(self, max_bytes: int) -> Optional[PhotoSize]:
+        """
+        Returns the largest size with a known file size not exceeding a budget.
+
+        :param max_bytes: Maximum file size in bytes
+        :return: Size, None if no size fits
+        """
+        index = bisect_right(self._bytes, max_bytes)
+        return self._by_bytes[index - 1] if index else None
+
+    def best(self, max_side: Optional[int] = None, max_bytes: Optional[int] = None) -> Optional[PhotoSize]:
+        """
+        Returns the largest size within both a dimension limit and a byte budget.
+
+        :param max_side: Maximum width and height in pixels, None for no limit
+        :param max_bytes: Maximum file size in bytes, None for no limit
+        :return: Size, None if no size is within the limits
+        """
+        if max_bytes is None:
+            index = len(self.sizes) if max_side is None else bisect_right(self._sides, max_side)
+            return self.sizes[index - 1] if index else None
+        size = self.within(max_bytes)
+        if size is None or max_side is None or max(size.width, size.height) <= max_side:
+            return size
+        for index in range(bisect_right(self._sides, max_side) - 1, -1, -1):
+            size = self.sizes[index]
+            if size.file_size is not None and size.file_size <= max_bytes:
+                return size
+        return None
+
+    def aspect(self, ratio: float) -> Optional[PhotoSize]:
+        """
+        Returns the size with the aspect ratio closest to a ratio, the first in the sorted order on a tie.
+
+        :param ratio: Width divided by height
+        """
+        index = bisect_left(self._aspects, ratio)
+        if index == len(self._aspects):
+            return self._by_aspect[-1] if self._by_aspect else None
+        if index > 0 and ratio - self._aspects[index - 1] <= self._aspects[index] - ratio:
+            index -= 1
+        return self._by_aspect[index]
+
+def select(messages: Iterable[Message],
+           max_side: Optional[int] = None,
+           max_bytes: Optional[int] = None) -> list[Optional[PhotoSize]]:
+    """
+    Selects a size of the photo or thumbnail of every message of a batch, e.g. a page of getUpdates results,
+    reusing the indexes kept by PhotoSizes.of.
+
+    :param messages: Messages
+    :param max_side: Maximum width and height in pixels, None for no limit
+    :param max_bytes: Maximum file size in bytes, None for no limit
+    :return: For every message, the largest size within both limits, None if the message has no photo or
+             thumbnail or no size fits the byte budget
+    """
+    return [PhotoSizes.of(message).best(max_side, max_bytes) for message in messages]
@@ -0,0 +1,213 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Optional
+
+from .update import Update
+from .histogram import Histogram
+from .http_connection import HttpError, read_headers
+
+logger = logging.getLogger(__name__)
+
+_UPDATE_FIELDS = tuple(name for name in Update.__slots__ if name != "update_id")
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+"""
+Quantiles of stage durations exported by Pipeline.metrics.
+"""
+
+def update_type(update: Any) -> str:
+    """
+    Returns the type of an update, i.e. the name of its field besides update_id.
+
+    :param update: Update or its decoded JSON object
+    :return: Type of the update, e.g. message or callback_query; unknown if it has no other field
+    """
+    if isinstance(update, dict):
+        for key in update:
+            if key != "update_id":
+                return key
+        return "unknown"
+    for name in _UPDATE_FIELDS:
+        if getattr(update, name, None) is not None:
+            return name
+    return "unknown"
+
+class _Stage:
+    __slots__ = ("name",
+                 "function",
+                 "is_coroutine",
+                 "histogram",
+                 "dropped",
+                 "failed")
+
+    def __init__(self, name: str, function: Callable[[Any], Any], precision: int):
+        self.name = name
+        self.function = function
+        self.is_coroutine = asyncio.iscoroutinefunction(function)
+        self.histogram = Histogram(precision)
+        self.dropped = 0
+        self.failed = 0
+
+class Pipeline:
+    """
+    Passes every received update through a chain of stages, e.g. decode, dedupe, route, handle and send,
+    measuring the time spent in each.
+
+    A stage is a function or coroutine function called with the result of the previous stage; the first one
+    is called with the value put into the pipeline. A stage returning None ends the chain for that update, which is
+    counted as dropped by the stage, and a stage raising an exception ends it as failed. The duration of every stage
+    call and of the whole chain is recorded in a Histogram, and updates are counted by type, for a cost of about
+    0.25 microseconds per stage. Metrics are exported in the Prometheus text format.
+
+    https://prometheus.io/docs/instrumenting/exposition_formats/
+    """
+
+    def __init__(self,
+                 stages: list[tuple[str, Callable[[Any], Any]]],
+                 namespace: str = "bf_telegram",
+                 precision: int = 6):
+        """
+        :param stages: Names and functions of the stages, in order
+        :param namespace: Prefix of the exported metric names
+        :param precision: Number of significant bits of recorded durations
+        """
+        self.namespace = namespace
+        self.updates: dict[str, int] = {}
+        self.total = Histogram(precision)
+        self._stages = [_Stage(name, function, precision) for name, function in stages]
+
+    async def put(self, update: Any) -> Any:
+        """
+        Passes an update through the stages.
+
+        :param update: Received update, or its decoded JSON object if the first stage decodes it
+        :return: Result of the last stage, None if the update was dropped or a stage failed
+        """
+        kind = update_type(update)
+        self.updates[kind] = self.updates.get(kind, 0) + 1
+        clock = time.perf_counter_ns
+        value = update
+        start = first = clock()
+        for stage in self._stages:
+            try:
+                value = stage.function(value)
+                if stage.is_coroutine:
+                    value = await value
+            except Exception:
+                stage.failed += 1
+                logger.exception("Update %s %s stage failed", _update_id(update), stage.name)
+                value = None
+            else:
+                if value is None:
+                    stage.dropped += 1
+            end = clock()
+            stage.histogram.record(end - start)
+            start = end
+            if value is None:
+                break
+        self.total.record(start - first)
+        return value
+
+    def stage(self, name: str) -> Histogram:
+        """
+        Returns the durations of the calls of a stage.
+
+        :param name: Name of the stage
+        :return: Histogram of durations in nanoseconds
+        """
+        for stage in self._stages:
+            if stage.name == name:
+                return stage.histogram
+        raise KeyError(name)
+
+    def reset(self):
+        """
+        Forgets recorded durations and counts.
+        """
+        self.updates = {}
+        self.total.reset()
+        for stage in self._stages:
+            stage.histogram.reset()
+            stage.dropped = stage.failed = 0
+
+    def metrics(self) -> str:
+        """
+        Formats the metrics in the Prometheus text format: stage and total durations as summaries in seconds,
+        and counters of updates by type and of updates dropped and failed by stage.
+
+        :return: Metrics
+        """
+        prefix = self.namespace + "_" if self.namespace else ""
+        lines = [f"# HELP {prefix}updates_total Updates put into the pipeline by type.",
+                 f"# TYPE {prefix}updates_total counter"]
+        lines += [f'{prefix}updates_total{{type="{kind}"}} {count}' for kind, count in sorted(self.updates.items())]
+        lines += [f"# HELP {prefix}stage_seconds Duration of pipeline stage calls.",
+                  f"# TYPE {prefix}stage_seconds summary"]
+        for stage in self._stages:
+            lines += _summary(f"{prefix}stage_seconds", f'stage="{stage.name}"', stage.histogram)
+        lines += [f"# HELP {prefix}pipeline_seconds Duration of updates passing through the pipeline.",
+                  f"# TYPE {prefix}pipeline_seconds summary"]
+        lines += _summary(f"{prefix}pipeline_seconds", "", self.total)
+        for name, help_ in (("dropped", "ended by a stage returning None"), ("failed", "ended by a stage error")):
+            lines += [f"# HELP {prefix}stage_{name}_total Updates {help_}.",
+                      f"# TYPE {prefix}stage_{name}_total counter"]
+            lines += [f'{prefix}stage_{name}_total{{stage="{stage.name}"}} {getattr(stage, name)}'
+                      for stage in self._stages]
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path: str):
+        """
+        Writes the metrics to a file, replacing it at once, e.g. for the textfile collector of node_exporter.
+
+        :param path: Path of the file, usually ending with .prom
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.metrics())
+        os.replace(temporary, path)
+
+    async def serve_metrics(self, host: Optional[str] = "127.0.0.1", port: int = 9464) -> asyncio.AbstractServer:
+        """
+        Starts an HTTP server answering every GET request with the metrics, to be scraped by Prometheus.
+
+        :param host: Interface to listen on, None for all interfaces
+        :param port: TCP port
+        :return: Server, closed by the caller
+        """
+        return await asyncio.start_server(self._serve, host, port)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                await read_headers(reader)
+                if line.startswith(b"GET "):
+                    body = self.metrics().encode()
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+                else:
+                    writer.write(b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (HttpError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+def _update_id(update: Any) -> Any:
+    return update.get("update_id") if isinstance(update, dict) else getattr(update, "update_id", None)
+
+def _summary(name: str, labels: str, histogram: Histogram) -> list[str]:
+    separator = "," if labels else ""
+    lines = [f'{name}{{{labels}{separator}quantile="{quantile}"}} {histogram.percentile(quantile * 100) / 1e9:.9f}'
+             for quantile in QUANTILES]
+    labels = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{labels} {histogram.sum / 1e9:.9f}")
+    lines.append(f"{name}_count{labels} {histogram.count}")
+    return lines
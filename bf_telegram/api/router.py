@@ -0,0 +1,125 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from .message import Message
+from .update import Update
+from .entity_text import EntityText
+
+Handler = Callable[[Message, str], Awaitable[Any]]
+
+def _chat_types(chat_types: Optional[Iterable[str]]) -> tuple[Optional[str], ...]:
+    return (None,) if chat_types is None else tuple(chat_types)
+
+class Router:
+    """
+    Routes messages to handlers by bot command, entity type and chat type.
+
+    Routes are kept in hash tables keyed by (command, chat type) and (entity type, chat type), so matching a message
+    takes the same time however many handlers are registered. A route for a specific chat type takes precedence over
+    a route for all chat types.
+    """
+
+    def __init__(self, username: Optional[str] = None):
+        """
+        :param username: Username of the bot, commands addressed to other bots (/command@other_bot) are not routed,
+                         None to route commands addressed to any bot
+        """
+        self.username = username.lower() if username is not None else None
+        self._commands: dict[tuple[str, Optional[str]], Handler] = {}
+        self._entities: dict[tuple[str, Optional[str]], Handler] = {}
+        self._fallbacks: dict[Optional[str], Handler] = {}
+
+    def command(self, command: str, handler: Handler, chat_types: Optional[Iterable[str]] = None):
+        """
+        Routes a bot command to a handler called with the message and the text following the command.
+
+        :param command: Command without the slash, e.g. "start"
+        :param handler: Coroutine function
+        :param chat_types: Chat types to route from (“private”, “group”, “supergroup” or “channel”), None for all
+        """
+        for chat_type in _chat_types(chat_types):
+            self._commands[command.lower(), chat_type] = handler
+
+    def entity(self, type_: str, handler: Handler, chat_types: Optional[Iterable[str]] = None):
+        """
+        Routes messages containing an entity of a type to a handler called with the message and the text of the first such entity.
+        Only messages without a routed command are routed by entities.
+
+        :param type_: Entity type, e.g. “url” or “hashtag”
+        :param handler: Coroutine function
+        :param chat_types: Chat types to route from, None for all
+        """
+        for chat_type in _chat_types(chat_types):
+            self._entities[type_, chat_type] = handler
+
+    def fallback(self, handler: Handler, chat_types: Optional[Iterable[str]] = None):
+        """
+        Routes messages not matching any other route to a handler called with the message and its text or caption.
+
+        :param handler: Coroutine function
+        :param chat_types: Chat types to route from, None for all
+        """
+        for chat_type in _chat_types(chat_types):
+            self._fallbacks[chat_type] = handler
+
+    def match(self, message: Message) -> Optional[tuple[Handler, str]]:
+        """
+        Finds the route of a message.
+
+        :param message: Message
+        :return: Handler and the text it is called with, None if no route matches
+        """
+        text = message.text
+        entities = message.entities
+        if text is None:
+            text = message.caption
+            entities = message.caption_entities
+        chat_type = message.chat.type if message.chat is not None else None
+        if not entities:
+            handler = self._fallbacks.get(chat_type) or self._fallbacks.get(None)
+            return (handler, text or "") if handler is not None else None
+
+        index = EntityText(text)
+        first = entities[0]
+        if first.type == "bot_command" and first.offset == 0 and self._commands:
+            command, _, username = index.slice(0, first.length)[1:].partition("@")
+            if not username or self.username is None or username.lower() == self.username:
+                command = command.lower()
+                handler = self._commands.get((command, chat_type)) or self._commands.get((command, None))
+                if handler is not None:
+                    return handler, text[index.index(first.length):].strip()
+        if self._entities:
+            for entity in entities:
+                handler = self._entities.get((entity.type, chat_type)) or self._entities.get((entity.type, None))
+                if handler is not None:
+                    return handler, index.slice(entity.offset, entity.length)
+        handler = self._fallbacks.get(chat_type) or self._fallbacks.get(None)
+        return (handler, text) if handler is not None else None
+
+    async def route(self, message: Message) -> bool:
+        """
+        Calls the handler of the route of a message.
+
+        :param message: Message
+        :return: True, if a route matched
+        """
+        route = self.match(message)
+        if route is None:
+            return False
+        await route[0](message, route[1])
+        return True
+
+    async def handle(self, update: Update) -> bool:
+        """
+        Routes the message, channel post or their edited version of an update, e.g. as the handler of a Dispatcher.
+
+        :param update: Update
+        :return: True, if a route matched
+        """
+        message = update.message or update.channel_post or update.edited_message or update.edited_channel_post
+        return message is not None and await self.route(message)
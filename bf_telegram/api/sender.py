@@ -0,0 +1,276 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .bot_api import BotApi, BotApiError
+
+if TYPE_CHECKING:
+    from .migrations import MigrationTracker
+
+class TokenBucket:
+    """
+    Token bucket rate limiter driven by an externally supplied clock.
+    """
+
+    __slots__ = ("rate",
+                 "capacity",
+                 "tokens",
+                 "updated")
+
+    def __init__(self, rate: float, capacity: float = 1, now: float = 0):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of tokens, i.e. the allowed burst
+        :param now: Current time in seconds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """
+        Returns the time left until a token is available.
+
+        :param now: Current time in seconds
+        :return: Delay in seconds, 0 if a token is available
+        """
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        return 0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, now: float):
+        """
+        Takes a token, possibly going into debt.
+
+        :param now: Current time in seconds
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate) - 1
+        self.updated = now
+
+    def is_full(self, now: float) -> bool:
+        """
+        Returns True if the bucket has refilled completely, i.e. its state no longer matters.
+
+        :param now: Current time in seconds
+        """
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+    def block(self, now: float, seconds: float):
+        """
+        Makes the next token available only after the given time.
+
+        :param now: Current time in seconds
+        :param seconds: Time to wait in seconds
+        """
+        self.tokens = 1 - seconds * self.rate
+        self.updated = now
+
+class _Chat:
+    __slots__ = ("bucket",
+                 "requests",
+                 "queued",
+                 "sending")
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.requests: deque[tuple[str, dict, asyncio.Future, int]] = deque()
+        self.queued = False
+        self.sending = 0
+
+class Sender:
+    """
+    Sends Bot API requests addressed to chats within Telegram's rate limits.
+
+    Requests are queued per chat and scheduled by a global token bucket and a token bucket of every chat,
+    chats taking turns so a long queue for one chat does not delay others. A request answered with 429 is put back
+    at the head of its chat queue, which is paused for retry_after seconds. With a MigrationTracker, requests to a group
+    known to have migrated to a supergroup are sent to the supergroup, and a request answered with migrate_to_chat_id
+    is recorded and sent again to the supergroup.
+
+    https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+    """
+
+    def __init__(self,
+                 api: BotApi,
+                 global_rate: float = 30,
+                 chat_rate: float = 1,
+                 group_rate: float = 20 / 60,
+                 chat_burst: float = 1,
+                 max_retries: int = 5,
+                 migrations: Optional[MigrationTracker] = None):
+        """
+        :param api: Bot API client
+        :param global_rate: Maximum number of requests per second overall
+        :param chat_rate: Maximum number of requests per second to a private chat
+        :param group_rate: Maximum number of requests per second to a group, supergroup or channel
+        :param chat_burst: Number of requests a chat may receive at once after being idle
+        :param max_retries: Maximum number of times a request answered with 429 or migrate_to_chat_id is repeated
+        :param migrations: Migrations of groups to supergroups, None to send requests to the given chats
+        """
+        self.api = api
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.migrations = migrations
+        self.sent = 0
+        self.retried = 0
+        self._bucket = TokenBucket(global_rate, max(1.0, global_rate / 10), time.monotonic())
+        self._chats: dict[Union[int, str], _Chat] = {}
+        self._ready: list[tuple[float, int, Union[int, str]]] = []
+        self._order = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sending: set[asyncio.Task] = set()
+
+    def start(self):
+        """
+        Starts the scheduler task.
+        """
+        self._task = asyncio.ensure_future(self._schedule())
+
+    def stop(self):
+        """
+        Stops the scheduler task and cancels the queued requests and the requests being sent,
+        so the pending call() coroutines raise CancelledError.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._sending:
+            task.cancel()
+        for chat in self._chats.values():
+            for _, _, future, _ in chat.requests:
+                future.cancel()
+            chat.requests.clear()
+            chat.queued = False
+        self._ready.clear()
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of requests waiting to be sent.
+        """
+        return sum(len(chat.requests) for chat in self._chats.values())
+
+    async def call(self, method: str, parameters: dict[str, Any]) -> Any:
+        """
+        Calls a Bot API method, scheduling the request if it has a chat_id parameter.
+
+        :param method: Method name, e.g. "sendMessage"
+        :param parameters: Method parameters
+        :return: The decoded "result" field of the response
+        """
+        chat_id = parameters.get("chat_id")
+        if chat_id is None:
+            return await self.api.call(method, parameters)
+        if self.migrations is not None and (new_id := self.migrations.get(chat_id)) is not None:
+            chat_id = new_id
+            parameters = dict(parameters, chat_id=new_id)
+        future = asyncio.get_running_loop().create_future()
+        self._put(chat_id, (method, parameters, future, 0))
+        return await future
+
+    def _put(self, chat_id: Union[int, str], request: tuple[str, dict, asyncio.Future, int]):
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            group = isinstance(chat_id, str) or chat_id < 0
+            bucket = TokenBucket(self.group_rate if group else self.chat_rate, self.chat_burst, time.monotonic())
+            chat = self._chats[chat_id] = _Chat(bucket)
+        chat.requests.append(request)
+        self._enqueue(chat_id, chat, time.monotonic())
+
+    def _enqueue(self, chat_id: Union[int, str], chat: _Chat, now: float):
+        if not chat.queued:
+            chat.queued = True
+            heapq.heappush(self._ready, (now + chat.bucket.delay(now), next(self._order), chat_id))
+            self._wakeup.set()
+
+    def _prune(self, now: float):
+        # A chat with a request being sent is kept, as the request may be put back in its queue
+        for chat_id in [chat_id for chat_id, chat in self._chats.items()
+                        if not chat.queued and not chat.requests and not chat.sending and chat.bucket.is_full(now)]:
+            del self._chats[chat_id]
+
+    async def _schedule(self):
+        last_prune = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now - last_prune > 60:
+                self._prune(now)
+                last_prune = now
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            ready_at, _, chat_id = self._ready[0]
+            delay = max(ready_at - now, self._bucket.delay(now))
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._ready)
+            chat = self._chats[chat_id]
+            chat.queued = False
+            if not chat.requests:
+                continue
+            if chat.bucket.delay(now) > 0:
+                self._enqueue(chat_id, chat, now)
+                continue
+            self._bucket.take(now)
+            chat.bucket.take(now)
+            request = chat.requests.popleft()
+            if chat.requests:
+                self._enqueue(chat_id, chat, now)
+            chat.sending += 1
+            task = asyncio.ensure_future(self._send(chat_id, chat, *request))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, chat_id: Union[int, str], chat: _Chat, method: str, parameters: dict, future: asyncio.Future,
+                    retries: int):
+        if self.migrations is not None and (new_id := self.migrations.get(parameters["chat_id"])) is not None:
+            parameters = dict(parameters, chat_id=new_id)
+        try:
+            result = await self.api.call(method, parameters)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BotApiError as error:
+            new_id = error.migrate_to_chat_id
+            if new_id is not None and self.migrations is not None and retries < self.max_retries:
+                self.retried += 1
+                self.migrations.put(parameters["chat_id"], new_id)
+                self._put(new_id, (method, dict(parameters, chat_id=new_id), future, retries + 1))
+                return
+            if error.retry_after is None or retries >= self.max_retries:
+                if not future.done():
+                    future.set_exception(error)
+                return
+            self.retried += 1
+            now = time.monotonic()
+            chat.bucket.block(now, error.retry_after)
+            chat.requests.appendleft((method, parameters, future, retries + 1))
+            self._enqueue(chat_id, chat, now)
+            return
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        finally:
+            chat.sending -= 1
+        self.sent += 1
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,15 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+class TelegramObject:
+    """
+    Base class of all API types.
+
+    Fields are stored in __slots__ declared by every type, so instances carry no per-instance dict.
+    Constructors and decoders assign every field, so reading a name that is not a field raises AttributeError.
+    """
+
+    __slots__ = ()
@@ -2,11 +2,19 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from typing import Optional
+from __future__ import annotations
 
-from webhook_info import WebhookInfo
+from typing import TYPE_CHECKING, Optional
 
-class Update:
+from .telegram_object import TelegramObject
+from .webhook_info import WebhookInfo
+
+if TYPE_CHECKING:
+    from .bot_api import BotApi
+    from .input_file import InputFile
+    from .message import Message
+
+class Update(TelegramObject):
     """
     This object represents an incoming update.
     At most one of the optional parameters can be present in any given update.
@@ -14,6 +22,22 @@ class Update:
     https://core.telegram.org/bots/api#update
     """
 
+    __slots__ = ("update_id",
+                 "message",
+                 "edited_message",
+                 "channel_post",
+                 "edited_channel_post",
+                 "inline_query",
+                 "chosen_inline_result",
+                 "callback_query",
+                 "shipping_query",
+                 "pre_checkout_query",
+                 "poll",
+                 "poll_answer",
+                 "my_chat_member",
+                 "chat_member",
+                 "chat_join_request")
+
     def __init__(self,
                  update_id: int,
                  message: Optional[Message] = None,
@@ -63,14 +87,17 @@ class Update:
         self.chat_member = chat_member
         self.chat_join_request = chat_join_request
 
-    def get_updates(self,
-                    offset: Optional[int] = None,
-                    limit: Optional[int] = None,
-                    timeout: Optional[int] = None,
-                    allowed_updates: Optional[list[str]] = None) -> list[Update]:
+    @staticmethod
+    async def get_updates(api: BotApi,
+                          offset: Optional[int] = None,
+                          limit: Optional[int] = None,
+                          timeout: Optional[int] = None,
+                          allowed_updates: Optional[list[str]] = None) -> list[Update]:
         """
         Use this method to receive incoming updates using long polling.
+        See LongPolling for a polling loop built on top of it.
 
+        :param api: Bot API client
         :param offset: Identifier of the first update to be returned. Must be greater by one than the highest among the identifiers of previously received updates. By default, updates starting with the earliest unconfirmed update are returned. An update is considered confirmed as soon as getUpdates is called with an offset higher than its update_id. The negative offset can be specified to retrieve updates starting from -offset update from the end of the updates queue. All previous updates will forgotten.
         :param limit: Limits the number of updates to be retrieved. Values between 1-100 are accepted. Defaults to 100.
         :param timeout: Timeout in seconds for long polling. Defaults to 0, i.e. usual short polling. Should be positive, short polling should be used for testing purposes only.
@@ -79,19 +106,27 @@ class Update:
 
         https://core.telegram.org/bots/api#getupdates
         """
-        pass
-
-    def set_webhook(self,
-                    url: str,
-                    certificate: Optional[InputFile] = None,
-                    ip_address: Optional[str] = None,
-                    max_connections: Optional[int] = None,
-                    allowed_updates: Optional[list[str]] = None,
-                    drop_pending_updates: Optional[bool] = None,
-                    secret_token: Optional[str] = None) -> bool:
+        from .decoder import decode_updates  # The decoder imports this module
+
+        result = await api.call("getUpdates",
+                                {"offset": offset, "limit": limit, "timeout": timeout, "allowed_updates": allowed_updates},
+                                api.timeout + (timeout or 0))
+        return decode_updates(result)
+
+    @staticmethod
+    async def set_webhook(api: BotApi,
+                          url: str,
+                          certificate: Optional[InputFile] = None,
+                          ip_address: Optional[str] = None,
+                          max_connections: Optional[int] = None,
+                          allowed_updates: Optional[list[str]] = None,
+                          drop_pending_updates: Optional[bool] = None,
+                          secret_token: Optional[str] = None) -> bool:
         """
         Use this method to specify a URL and receive incoming updates via an outgoing webhook. Whenever there is an update for the bot, we will send an HTTPS POST request to the specified URL, containing a JSON-serialized Update. In case of an unsuccessful request, we will give up after a reasonable amount of attempts. Returns True on success. If you'd like to make sure that the webhook was set by you, you can specify secret data in the parameter secret_token. If specified, the request will contain a header “X-Telegram-Bot-Api-Secret-Token” with the secret token as content.
+        See WebhookServer for the receiving side.
 
+        :param api: Bot API client
         :param url: HTTPS URL to send updates to. Use an empty string to remove webhook integration
         :param certificate: Upload your public key certificate so that the root certificate in use can be checked. See our self-signed guide for details.
         :param ip_address: Upload your public key certificate so that the root certificate in use can be checked. See our self-signed guide for details.
@@ -103,25 +138,38 @@ class Update:
 
         https://core.telegram.org/bots/api#setwebhook
         """
-        pass
-
-    def delete_webhook(self, drop_pending_updates: Optional[bool] = None) -> bool:
+        return await api.call("setWebhook",
+                              {"url": url,
+                               "certificate": certificate,
+                               "ip_address": ip_address,
+                               "max_connections": max_connections,
+                               "allowed_updates": allowed_updates,
+                               "drop_pending_updates": drop_pending_updates,
+                               "secret_token": secret_token})
+
+    @staticmethod
+    async def delete_webhook(api: BotApi, drop_pending_updates: Optional[bool] = None) -> bool:
         """
         Use this method to remove webhook integration if you decide to switch back to getUpdates.
 
+        :param api: Bot API client
         :param drop_pending_updates: Pass True to drop all pending updates
         :return: Returns True on success.
 
         https://core.telegram.org/bots/api#deletewebhook
         """
-        pass
+        return await api.call("deleteWebhook", {"drop_pending_updates": drop_pending_updates})
 
-    def get_webhook_info(self) -> WebhookInfo:
+    @staticmethod
+    async def get_webhook_info(api: BotApi) -> WebhookInfo:
         """
         Use this method to get current webhook status. Requires no parameters.
 
+        :param api: Bot API client
         :return: On success, returns a WebhookInfo object. If the bot is using getUpdates, will return an object with the url field empty.
 
         https://core.telegram.org/bots/api#getwebhookinfo
         """
-        pass
+        from .decoder import decode  # The decoder imports this module
+
+        return decode(WebhookInfo, await api.call("getWebhookInfo"))
@@ -0,0 +1,240 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .update import Update
+from .decoder import decoder
+
+RECORD = struct.Struct("<qI")
+"""
+Header of a record in a segment: update_id and length of the JSON-serialized update following it.
+"""
+
+INDEX = struct.Struct("<qQ")
+"""
+Entry of a segment index: update_id and offset of its record.
+"""
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+class UpdateLogWriter:
+    """
+    Appends updates to a log of segment files in a directory.
+
+    Every segment (NNNNNNNN.log) is a sequence of records, each an update_id and a length followed by the update as
+    received, in JSON. Its index (NNNNNNNN.idx) holds the update_id and record offset of every record. A new segment
+    is started when the current one exceeds max_segment_size, when an update_id is not greater than the previous one
+    (Telegram restarts identifiers after a week without updates), and every time the log is opened, so existing
+    segments are never modified.
+    """
+
+    def __init__(self, directory: str, max_segment_size: int = 1 << 26):
+        """
+        :param directory: Log directory, created if missing
+        :param max_segment_size: Size of a segment in bytes after which a new one is started
+        """
+        self.directory = directory
+        self.max_segment_size = max_segment_size
+        os.makedirs(directory, exist_ok=True)
+        self._number = max(_segment_numbers(directory), default=0)
+        self._log = self._index = None
+        self._size = 0
+        self._last_id: Optional[int] = None
+
+    def _rotate(self):
+        self.close()
+        self._number += 1
+        path = os.path.join(self.directory, f"{self._number:08d}")
+        self._log = open(path + ".log", "xb")
+        self._index = open(path + ".idx", "xb")
+        self._size = 0
+
+    def append_raw(self, update_id: int, data: bytes):
+        """
+        Appends an update serialized as JSON, e.g. a webhook request body.
+
+        :param update_id: Identifier of the update
+        :param data: JSON-serialized update
+        """
+        if self._log is None or self._size >= self.max_segment_size or update_id <= self._last_id:
+            self._rotate()
+        self._index.write(INDEX.pack(update_id, self._size))
+        self._log.write(RECORD.pack(update_id, len(data)))
+        self._log.write(data)
+        self._size += RECORD.size + len(data)
+        self._last_id = update_id
+
+    def append(self, update: dict):
+        """
+        Appends an update.
+
+        :param update: Decoded JSON object of the update
+        """
+        self.append_raw(update["update_id"], _dumps(update).encode())
+
+    def extend(self, result: Iterable[dict]):
+        """
+        Appends the result of a getUpdates call.
+
+        :param result: Decoded JSON array of updates
+        """
+        for update in result:
+            self.append(update)
+
+    def flush(self):
+        """
+        Writes buffered records to the segment files.
+        """
+        if self._log is not None:
+            self._log.flush()
+            self._index.flush()
+
+    def close(self):
+        """
+        Closes the current segment.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._index.close()
+            self._log = self._index = None
+
+    def __enter__(self) -> UpdateLogWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+def _segment_numbers(directory: str) -> list[int]:
+    return sorted(int(name[:-4]) for name in os.listdir(directory) if name.endswith(".log") and name[:-4].isdigit())
+
+class _Segment:
+    __slots__ = ("data",
+                 "index",
+                 "count",
+                 "_files")
+
+    def __init__(self, path: str):
+        self._files = []
+        self.data = self._map(path + ".log")
+        self.index = self._map(path + ".idx")
+        self.count = len(self.index) // INDEX.size
+        # Drop index entries of a record not completely written
+        while self.count and not self._complete(self.count - 1):
+            self.count -= 1
+
+    def _map(self, path: str) -> Any:
+        file = open(path, "rb")
+        self._files.append(file)
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _complete(self, position: int) -> bool:
+        offset = INDEX.unpack_from(self.index, position * INDEX.size)[1]
+        if offset + RECORD.size > len(self.data):
+            return False
+        return offset + RECORD.size + RECORD.unpack_from(self.data, offset)[1] <= len(self.data)
+
+    def update_id(self, position: int) -> int:
+        return INDEX.unpack_from(self.index, position * INDEX.size)[0]
+
+    def search(self, update_id: int) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.update_id(middle) < update_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def records(self, start: int, end: Optional[int]) -> Iterator[tuple[int, bytes]]:
+        data = self.data
+        unpack = RECORD.unpack_from
+        offset = INDEX.unpack_from(self.index, start * INDEX.size)[1] if start < self.count else 0
+        for _ in range(start, self.count):
+            update_id, length = unpack(data, offset)
+            if end is not None and update_id > end:
+                return
+            offset += RECORD.size
+            yield update_id, data[offset:offset + length]
+            offset += length
+
+    def close(self):
+        for mapping in (self.data, self.index):
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+        for file in self._files:
+            file.close()
+
+class UpdateLogReader:
+    """
+    Reads a log written by UpdateLogWriter, memory-mapping its segments.
+    Records are located through the segment indexes by binary search, so reading a range of updates does not read
+    the records before it. A record not completely written at the end of a segment is ignored.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Log directory
+        """
+        self.directory = directory
+        self._segments = [_Segment(os.path.join(directory, f"{number:08d}")) for number in _segment_numbers(directory)]
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self._segments)
+
+    def records(self, first_id: Optional[int] = None, last_id: Optional[int] = None) -> Iterator[tuple[int, bytes]]:
+        """
+        Iterates over the records of updates in the order they were written.
+
+        :param first_id: Lowest update_id to return, None for no limit
+        :param last_id: Highest update_id to return, None for no limit
+        :return: Iterator of update identifiers and JSON-serialized updates
+        """
+        for segment in self._segments:
+            if not segment.count:
+                continue
+            if first_id is not None and segment.update_id(segment.count - 1) < first_id:
+                continue
+            if last_id is not None and segment.update_id(0) > last_id:
+                continue
+            yield from segment.records(segment.search(first_id) if first_id is not None else 0, last_id)
+
+    def updates(self,
+                first_id: Optional[int] = None,
+                last_id: Optional[int] = None,
+                decode: Callable[[dict], Any] = decoder(Update)) -> Iterator[Any]:
+        """
+        Iterates over updates in the order they were written, decoding them.
+
+        :param first_id: Lowest update_id to return, None for no limit
+        :param last_id: Highest update_id to return, None for no limit
+        :param decode: Function building an update from its decoded JSON object
+        :return: Iterator of updates
+        """
+        loads = json.loads
+        for _, data in self.records(first_id, last_id):
+            yield decode(loads(data))
+
+    def close(self):
+        """
+        Unmaps and closes all segments.
+        """
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def __enter__(self) -> UpdateLogReader:
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
@@ -0,0 +1,157 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from .update import Update
+
+class UpdateSequencer:
+    """
+    Drops repeated updates and passes the others to a handler in update_id order.
+
+    Updates are kept in a ring buffer indexed by update_id relative to the lowest identifier not passed yet,
+    so memory is bounded by the window size and every check is O(1). Identifiers below it were already passed
+    and are dropped as repeated. A missing update is waited for at most gap_timeout seconds and then skipped;
+    if it arrives later, it is passed out of order. An update more than window identifiers away from the expected one
+    restarts the sequence, as Telegram picks a random identifier after a week without updates.
+
+    When a sequence starts, nothing is known about the updates delivered before the first one received, so updates
+    are held for gap_timeout seconds and the sequence starts at the lowest identifier received meanwhile.
+
+    https://core.telegram.org/bots/api#update
+    """
+
+    def __init__(self, handler: Callable[[Update], Awaitable[Any]], window: int = 1024, gap_timeout: float = 1):
+        """
+        :param handler: Coroutine function called with every update, awaited before the next update is passed
+        :param window: Maximum number of updates held while waiting for a missing one
+        :param gap_timeout: Time to wait for a missing update in seconds
+        """
+        self.handler = handler
+        self.window = window
+        self.gap_timeout = gap_timeout
+        self.next_id: Optional[int] = None
+        self.repeated = 0
+        self.skipped = 0
+        self.late = 0
+        self._pending: list[Optional[Update]] = [None] * window
+        self._count = 0
+        self._skipped_ids: set[int] = set()
+        self._skipped_order: deque[int] = deque()
+        self._lock = asyncio.Lock()
+        self._gap_timer: Optional[asyncio.TimerHandle] = None
+        self._gap_id: Optional[int] = None
+        self._start_timer: Optional[asyncio.TimerHandle] = None
+        self._highest_id = 0
+
+    async def put(self, update: Update):
+        """
+        Accepts a received update and passes it and all updates following it without gaps to the handler.
+
+        :param update: Received update
+        """
+        async with self._lock:
+            update_id = update.update_id
+            if self.next_id is None or update_id < self.next_id - self.window:
+                await self._release_all()
+                self._start(update_id)
+            elif update_id < self.next_id and self._start_timer is not None \
+                    and update_id > self._highest_id - self.window:
+                self.next_id = update_id  # Delivered late while the sequence starts
+            elif update_id < self.next_id:
+                if update_id in self._skipped_ids:
+                    self._skipped_ids.discard(update_id)
+                    self.late += 1
+                    await self.handler(update)
+                else:
+                    self.repeated += 1
+                return
+            elif update_id >= self.next_id + self.window:
+                await self._release_all()
+                self._start(update_id)
+
+            index = update_id % self.window
+            if self._pending[index] is not None:
+                self.repeated += 1
+                return
+            self._pending[index] = update
+            self._count += 1
+            if self._start_timer is None:
+                await self._release()
+            elif update_id > self._highest_id:
+                self._highest_id = update_id
+
+    def _start(self, update_id: int):
+        self.next_id = self._highest_id = update_id
+        self._start_timer = asyncio.get_running_loop().call_later(self.gap_timeout, self._on_start_timeout)
+
+    def _on_start_timeout(self):
+        self._start_timer = None
+        asyncio.ensure_future(self._started())
+
+    async def _started(self):
+        async with self._lock:
+            if self._start_timer is None:
+                await self._release()
+
+    async def flush(self):
+        """
+        Passes all held updates to the handler, skipping missing ones.
+        """
+        async with self._lock:
+            await self._release_all()
+
+    async def _release(self):
+        pending = self._pending
+        window = self.window
+        while self._count:
+            index = self.next_id % window
+            update = pending[index]
+            if update is None:
+                break
+            pending[index] = None
+            self._count -= 1
+            self.next_id += 1
+            await self.handler(update)
+        if self._gap_id == self.next_id and self._count:
+            return
+        if self._gap_timer is not None:
+            self._gap_timer.cancel()
+            self._gap_timer = None
+        self._gap_id = None
+        if self._count:
+            self._gap_id = self.next_id
+            self._gap_timer = asyncio.get_running_loop().call_later(self.gap_timeout, self._on_gap_timeout)
+
+    async def _release_all(self):
+        if self._start_timer is not None:
+            self._start_timer.cancel()
+            self._start_timer = None
+        await self._release()
+        while self._count:
+            self._skip_missing()
+            await self._release()
+
+    def _skip_missing(self):
+        while self._pending[self.next_id % self.window] is None:
+            self._skipped_ids.add(self.next_id)
+            self._skipped_order.append(self.next_id)
+            if len(self._skipped_order) > self.window:
+                self._skipped_ids.discard(self._skipped_order.popleft())
+            self.skipped += 1
+            self.next_id += 1
+
+    def _on_gap_timeout(self):
+        self._gap_timer = None
+        asyncio.ensure_future(self._skip_gap())
+
+    async def _skip_gap(self):
+        async with self._lock:
+            if self._count and self._gap_id == self.next_id:
+                self._skip_missing()
+                await self._release()
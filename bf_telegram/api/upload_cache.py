@@ -0,0 +1,113 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .bot_api import BotApiError
+from .input_file import InputFile
+
+class UploadCache:
+    """
+    Remembers the file_id Telegram assigned to uploaded contents, so sending the same contents again reuses the file
+    instead of uploading it.
+
+    Files are identified by the SHA-256 hash of their contents. The file_id is taken from the field of the sent message
+    named like the parameter, e.g. "document" for sendDocument, and the largest size for "photo". Simultaneous uploads
+    of the same contents are made once. A file_id rejected by Telegram is forgotten and the file is uploaded again.
+    """
+
+    def __init__(self, api: Any, max_size: int = 100000):
+        """
+        :param api: Object calling Bot API methods, a BotApi or a Sender
+        :param max_size: Maximum number of file identifiers kept, the least recently used ones are forgotten
+        """
+        self.api = api
+        self.max_size = max_size
+        self.hits = 0
+        self.uploads = 0
+        self._file_ids: OrderedDict[str, str] = OrderedDict()
+        self._uploads: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._file_ids)
+
+    def get(self, file: InputFile) -> Optional[str]:
+        """
+        Returns the file_id of previously uploaded contents.
+
+        :param file: File
+        :return: File identifier, None if the contents were not uploaded
+        """
+        file_id = self._file_ids.get(file.digest())
+        if file_id is not None:
+            self._file_ids.move_to_end(file.digest())
+        return file_id
+
+    def put(self, file: InputFile, file_id: str):
+        """
+        Remembers the file_id of uploaded contents.
+
+        :param file: File
+        :param file_id: File identifier assigned by Telegram
+        """
+        self._file_ids[file.digest()] = file_id
+        self._file_ids.move_to_end(file.digest())
+        if len(self._file_ids) > self.max_size:
+            self._file_ids.popitem(last=False)
+
+    async def call(self, method: str, parameters: dict[str, Any]) -> Any:
+        """
+        Calls a Bot API method sending files, replacing InputFile parameters with the file_id of identical contents
+        sent before.
+
+        :param method: Method name, e.g. "sendDocument"
+        :param parameters: Method parameters
+        :return: The decoded "result" field of the response
+        """
+        files = {name: value for name, value in parameters.items() if isinstance(value, InputFile)}
+        if not files:
+            return await self.api.call(method, parameters)
+        digests = {name: await asyncio.to_thread(file.digest) for name, file in files.items()}
+        waiting = [self._uploads[digest] for digest in digests.values() if digest in self._uploads]
+        if waiting:
+            await asyncio.wait(waiting)
+        cached = {name: self.get(file) for name, file in files.items()}
+        if all(cached.values()):
+            try:
+                self.hits += 1
+                return await self.api.call(method, dict(parameters, **cached))
+            except BotApiError as error:
+                if error.error_code != 400:
+                    raise
+                for file in files.values():
+                    self._file_ids.pop(file.digest(), None)
+        future = asyncio.get_running_loop().create_future()
+        for digest in digests.values():
+            self._uploads.setdefault(digest, future)
+        try:
+            self.uploads += 1
+            result = await self.api.call(method, parameters)
+            for name, file in files.items():
+                file_id = self._file_id(result, name)
+                if file_id is not None:
+                    self.put(file, file_id)
+            return result
+        finally:
+            for digest in digests.values():
+                if self._uploads.get(digest) is future:
+                    del self._uploads[digest]
+            future.set_result(None)
+
+    @staticmethod
+    def _file_id(result: Any, name: str) -> Optional[str]:
+        if not isinstance(result, dict):
+            return None
+        media = result.get(name)
+        if isinstance(media, list):
+            media = media[-1] if media else None
+        return media.get("file_id") if isinstance(media, dict) else None
@@ -2,15 +2,31 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-class User:
+from .telegram_object import TelegramObject
+
+class User(TelegramObject):
     """
     This object represents a Telegram user or bot.
 
     https://core.telegram.org/bots/api#user
     """
 
+    __slots__ = ("id_",
+                 "is_bot",
+                 "first_name",
+                 "last_name",
+                 "username",
+                 "language_code",
+                 "is_premium",
+                 "added_to_attachment_menu",
+                 "can_join_groups",
+                 "can_read_all_group_messages",
+                 "supports_inline_queries")
+
     def __init__(self,
                  id_: int,
                  is_bot: bool,
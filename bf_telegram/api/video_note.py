@@ -2,15 +2,29 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-from typing import Optional
+from __future__ import annotations
 
-class VideoNote:
+from typing import TYPE_CHECKING, Optional
+
+from .telegram_object import TelegramObject
+
+if TYPE_CHECKING:
+    from .photo_size import PhotoSize
+
+class VideoNote(TelegramObject):
     """
     This object represents a video message (available in Telegram apps as of v.4.0).
 
     https://core.telegram.org/bots/api#videonote
     """
 
+    __slots__ = ("file_id",
+                 "file_unique_id",
+                 "length",
+                 "duration",
+                 "thumb",
+                 "file_size")
+
     def __init__(self,
                  file_id: str,
                  file_unique_id: str,
@@ -2,15 +2,29 @@
 #  License, v. 2.0. If a copy of the MPL was not distributed with this
 #  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+from __future__ import annotations
+
 from typing import Optional
 
-class WebhookInfo:
+from .telegram_object import TelegramObject
+
+class WebhookInfo(TelegramObject):
     """
     Describes the current status of a webhook.
 
     https://core.telegram.org/bots/api#webhookinfo
     """
 
+    __slots__ = ("url",
+                 "has_custom_certificate",
+                 "pending_update_count",
+                 "ip_address",
+                 "last_error_date",
+                 "last_error_message",
+                 "last_synchronization_error_date",
+                 "max_connections",
+                 "allowed_updates")
+
     def __init__(self,
                  url: str,
                  has_custom_certificate: bool,
@@ -0,0 +1,165 @@
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import logging
+import ssl
+from typing import Any, Awaitable, Callable, Optional
+
+from .update import Update
+from .decoder import decoder
+from .http_connection import BodyTooLargeError, HttpError, read_body, read_headers
+
+logger = logging.getLogger(__name__)
+
+_RESPONSES = {
+    200: b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n",
+    400: b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n",
+    403: b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\n\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n",
+    405: b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\n\r\n",
+    413: b"HTTP/1.1 413 Content Too Large\r\nConnection: close\r\nContent-Length: 0\r\n\r\n",
+    503: b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n",
+}
+
+class WebhookServer:
+    """
+    Receives updates sent by Telegram to a webhook set with Update.set_webhook.
+
+    Every request is answered as soon as its update is decoded and queued, handlers run in separate worker tasks,
+    so delivery connections are never held by slow handlers. When the queue is full, requests are answered
+    with 503 and Telegram delivers the update again later.
+
+    https://core.telegram.org/bots/api#setwebhook
+    """
+
+    def __init__(self,
+                 handler: Callable[[Update], Awaitable[Any]],
+                 secret_token: Optional[str] = None,
+                 path: str = "/",
+                 queue_size: int = 10000,
+                 workers: int = 1,
+                 decode: Callable[[dict], Update] = decoder(Update),
+                 max_body_size: int = 1 << 20,
+                 read_timeout: Optional[float] = 60):
+        """
+        :param handler: Coroutine function called with every update
+        :param secret_token: Secret token passed to setWebhook, requests without it are rejected
+        :param path: Path of the webhook URL
+        :param queue_size: Maximum number of received updates waiting for a worker
+        :param workers: Number of worker tasks calling the handler, updates are handled in order of arrival only with one
+        :param decode: Function decoding an update, e.g. decode_lazy_update
+        :param max_body_size: Maximum size of a request body in bytes, also with chunked transfer coding
+        :param read_timeout: Time limit for receiving a request in seconds, including the wait for it on an idle
+                             connection, after which the connection is closed; None for no limit
+        """
+        self.handler = handler
+        self.secret_token = secret_token.encode() if secret_token is not None else None
+        self.path = path
+        self.decode = decode
+        self.max_body_size = max_body_size
+        self.read_timeout = read_timeout
+        self.queue: asyncio.Queue[Update] = asyncio.Queue(queue_size)
+        self.workers = workers
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: list[asyncio.Task] = []
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: Optional[str] = None, port: int = 8443, ssl_context: Optional[ssl.SSLContext] = None):
+        """
+        Starts accepting connections and handling updates.
+
+        :param host: Interface to listen on, None for all interfaces
+        :param port: TCP port, Telegram supports 443, 80, 88 and 8443
+        :param ssl_context: TLS settings, None when TLS is terminated by a reverse proxy
+        """
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._serve, host, port, ssl=ssl_context, backlog=256)
+
+    @property
+    def sockets(self) -> list:
+        """
+        Listening sockets of the server.
+        """
+        return list(self._server.sockets) if self._server is not None else []
+
+    async def stop(self):
+        """
+        Stops accepting connections, closes open ones, handles the updates already queued and stops the workers.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections:
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _accept(self, target: bytes, headers: dict[str, str], body: bytes) -> int:
+        if target.split(b"?", 1)[0].decode("latin-1") != self.path:
+            return 404
+        if self.secret_token is not None:
+            token = headers.get("x-telegram-bot-api-secret-token", "").encode("latin-1")
+            if not hmac.compare_digest(token, self.secret_token):
+                return 403
+        try:
+            update = self.decode(json.loads(body))
+        except (ValueError, TypeError, AttributeError):
+            return 400
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            return 503
+        return 200
+
+    async def _read(self, reader: asyncio.StreamReader) -> Optional[tuple[bytes, bytes, dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        method, target, _ = line.split(b" ", 2)
+        headers = await read_headers(reader)
+        return method, target, headers, await read_body(reader, headers, max_size=self.max_body_size)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # Aborting the connection at the deadline ends the read without a task per request, as wait_for needs
+                timer = loop.call_later(self.read_timeout, writer.transport.abort) \
+                    if self.read_timeout is not None else None
+                try:
+                    request = await self._read(reader)
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+                if request is None:
+                    break
+                method, target, headers, body = request
+                writer.write(_RESPONSES[self._accept(target, headers, body) if method == b"POST" else 405])
+                await writer.drain()
+        except BodyTooLargeError:
+            writer.write(_RESPONSES[413])
+        except (HttpError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _work(self):
+        while True:
+            update = await self.queue.get()
+            try:
+                await self.handler(update)
+            except Exception:
+                logger.exception("Update %s handler failed", update.update_id)
+            finally:
+                self.queue.task_done()